@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import sys
+
+import degrees
+
+# Command-line switches accepted by main
+OPTIONS = {"--compact"}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    workers = [option for option in options if option.startswith("--workers=")]
+    options = [option for option in options if option not in workers]
+    if (len(args) > 2 or len(workers) > 1
+            or any(option not in OPTIONS for option in options)):
+        sys.exit("Usage: python batch.py [--compact] [--workers=N] "
+                 "[directory] [queries]")
+    directory = args[0] if args else "large"
+    queries = args[1] if len(args) == 2 else "-"
+    compact = "--compact" in options
+    try:
+        workers = int(workers[0].split("=", 1)[1]) if workers else 1
+    except ValueError:
+        sys.exit("Number of workers must be an integer.")
+
+    # Load data from files into memory
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory, compact=compact)
+    print("Data loaded.", file=sys.stderr)
+
+    if queries == "-":
+        pairs = read_pairs(sys.stdin)
+    else:
+        with open(queries, encoding="utf-8") as f:
+            pairs = read_pairs(f)
+
+    if workers <= 1:
+        for line in run(pairs):
+            print(line, flush=True)
+        return
+
+    with worker_pool(workers, directory, compact) as pool:
+        for line in run(pairs, pool):
+            print(line, flush=True)
+
+
+def worker_pool(workers, directory, compact):
+    """
+    Returns a pool of worker processes sharing the loaded data.
+
+    Forked workers inherit the parent's memory copy-on-write, so nothing
+    is reloaded. Where fork is unavailable, each worker loads the data
+    itself, which maps the directory's snapshot if it has one.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork").Pool(workers)
+    return multiprocessing.Pool(
+        workers, initializer=degrees.load_data, initargs=(directory, compact)
+    )
+
+
+def read_pairs(f):
+    """
+    Returns the (source, target) name pairs in a file with one
+    tab-separated pair per line, skipping blank lines.
+    """
+    pairs = []
+    for line in f:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        names = line.split("\t")
+        if len(names) != 2:
+            pairs.append((line, None))
+        else:
+            pairs.append((names[0].strip(), names[1].strip()))
+    return pairs
+
+
+def run(pairs, pool=None):
+    """
+    Answers every (source, target) name pair, and yields one JSON line
+    per pair in input order, as soon as all earlier pairs are answered.
+
+    Pairs that share a source are answered from a single search. If a
+    pool is given, the searches are spread across its workers.
+    """
+    results = {}
+    groups = {}
+    for index, (source, target) in enumerate(pairs):
+        result = {"source": source, "target": target}
+        results[index] = result
+        if target is None:
+            result["error"] = "Expected a tab-separated pair of names."
+            continue
+        source_id, error = resolve(source)
+        target_id, target_error = resolve(target)
+        if error or target_error:
+            result["error"] = error or target_error
+            continue
+        groups.setdefault(source_id, []).append((index, target_id))
+
+    if pool is None:
+        answers = map(answer, groups.items())
+    else:
+        answers = pool.imap(answer, groups.items())
+
+    pending = 0
+    for group in answers:
+        for index, path in group:
+            results[index].update(path)
+        while pending in results and not waiting(results[pending]):
+            yield json.dumps(results.pop(pending))
+            pending += 1
+
+    while pending in results:
+        yield json.dumps(results.pop(pending))
+        pending += 1
+
+
+def waiting(result):
+    """
+    Returns True if a result has neither an answer nor an error yet.
+    """
+    return "degrees" not in result and "error" not in result
+
+
+def resolve(name):
+    """
+    Returns a (person_id, error) pair for a name, without prompting:
+    names shared by several people are reported as errors.
+    """
+    person_ids = degrees.person_ids_for_name(name)
+    if len(person_ids) == 0:
+        return None, f"Person not found: {name}"
+    elif len(person_ids) > 1:
+        return None, f"Ambiguous name: {name}"
+    return person_ids[0], None
+
+
+def answer(group):
+    """
+    Returns (index, fields) pairs answering every (index, target) query
+    of a (source, queries) group with a single breadth-first search.
+    """
+    source, queries = group
+    paths = degrees.shortest_paths(source, [target for _, target in queries])
+    answers = []
+    for index, target in queries:
+        path = paths[target]
+        if path is None:
+            answers.append((index, {"degrees": None, "path": None}))
+        else:
+            answers.append((index, {
+                "degrees": len(path),
+                "path": [[movie_id, person_id] for movie_id, person_id in path]
+            }))
+    return answers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import json
+import sys
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+URL = "http://127.0.0.1:8000"
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--url=")]
+    urls = [arg for arg in sys.argv[1:] if arg.startswith("--url=")]
+    if len(args) != 2 or len(urls) > 1:
+        sys.exit("Usage: python client.py [--url=URL] name name")
+    url = urls[0].split("=", 1)[1] if urls else URL
+
+    source = person_id_for_name(url, args[0])
+    if source is None:
+        sys.exit("Person not found.")
+    target = person_id_for_name(url, args[1])
+    if target is None:
+        sys.exit("Person not found.")
+
+    response = request(url, "/path", source=source, target=target)
+    if response["path"] is None:
+        print("Not connected.")
+    else:
+        print(f"{response['degrees']} degrees of separation.")
+        person1 = response["source_name"]
+        for i, step in enumerate(response["path"]):
+            person2 = step["name"]
+            print(f"{i + 1}: {person1} and {person2} "
+                  f"starred in {step['title']}")
+            person1 = person2
+
+
+def request(url, path, **query):
+    """
+    Sends a GET request to the degrees server, and returns its JSON reply.
+    """
+    try:
+        with urlopen(f"{url}{path}?{urlencode(query)}") as response:
+            return json.load(response)
+    except HTTPError as error:
+        return json.load(error)
+
+
+def person_id_for_name(url, name):
+    """
+    Returns the IMDB id for a person's name, asking the server
+    and resolving ambiguities as needed.
+    """
+    people = request(url, "/person", name=name)["people"]
+    if len(people) == 0:
+        return None
+    elif len(people) > 1:
+        print(f"Which '{name}'?")
+        for person in people:
+            print(f"ID: {person['id']}, Name: {person['name']}, "
+                  f"Birth: {person['birth']}")
+        person_id = input("Intended Person ID: ")
+        if person_id in [person["id"] for person in people]:
+            return person_id
+        return None
+    else:
+        return people[0]["id"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import csv
+from array import array
+from collections.abc import Mapping
+
+
+class CompactGraph():
+    """
+    Bipartite graph of people and the movies they starred in.
+
+    Person and movie ids are interned to dense integers, and the edges are
+    stored in CSR form: the movies of person p are
+    person_movies[person_offsets[p]:person_offsets[p + 1]], and the stars
+    of movie m are movie_people[movie_offsets[m]:movie_offsets[m + 1]].
+
+    components[p] labels the connected component of person p, and is
+    computed from the arrays unless given.
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_people,
+                 components=None):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+        if components is None:
+            components = self.label_components()
+        self.components = components
+
+        # Maps the original string ids back to their dense integers
+        self.person_index = {
+            person_id: i for i, person_id in enumerate(person_ids)
+        }
+        self.movie_index = {
+            movie_id: i for i, movie_id in enumerate(movie_ids)
+        }
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Load a graph from the people, movies and stars CSV files.
+        """
+        person_ids, person_names, person_births = [], [], []
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                person_ids.append(row["id"])
+                person_names.append(row["name"])
+                person_births.append(row["birth"])
+
+        movie_ids, movie_titles, movie_years = [], [], []
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                movie_ids.append(row["id"])
+                movie_titles.append(row["title"])
+                movie_years.append(row["year"])
+
+        person_index = {
+            person_id: i for i, person_id in enumerate(person_ids)
+        }
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        # Intern every edge, skipping duplicates and unknown ids
+        seen = set()
+        edge_people = array("i")
+        edge_movies = array("i")
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    person = person_index[row["person_id"]]
+                    movie = movie_index[row["movie_id"]]
+                except KeyError:
+                    continue
+                edge = person * len(movie_ids) + movie
+                if edge in seen:
+                    continue
+                seen.add(edge)
+                edge_people.append(person)
+                edge_movies.append(movie)
+        del seen
+
+        person_offsets, person_movies = csr(
+            len(person_ids), edge_people, edge_movies
+        )
+        movie_offsets, movie_people = csr(
+            len(movie_ids), edge_movies, edge_people
+        )
+        return cls(person_ids, person_names, person_births,
+                   movie_ids, movie_titles, movie_years,
+                   person_offsets, person_movies, movie_offsets, movie_people)
+
+    def movies_for(self, person):
+        """
+        Returns the movies a person starred in.
+        """
+        offsets = self.person_offsets
+        return self.person_movies[offsets[person]:offsets[person + 1]]
+
+    def stars_for(self, movie):
+        """
+        Returns the people who starred in a movie.
+        """
+        offsets = self.movie_offsets
+        return self.movie_people[offsets[movie]:offsets[movie + 1]]
+
+    def label_components(self):
+        """
+        Returns an array labelling every person with the index
+        of the connected component they belong to.
+        """
+        labels = array("i", [-1]) * len(self.person_ids)
+        seen = bytearray(len(self.movie_ids))
+        label = 0
+        for person in range(len(self.person_ids)):
+            if labels[person] != -1:
+                continue
+            labels[person] = label
+            stack = [person]
+            while stack:
+                for movie in self.movies_for(stack.pop()):
+                    if seen[movie]:
+                        continue
+                    seen[movie] = 1
+                    for star in self.stars_for(movie):
+                        if labels[star] == -1:
+                            labels[star] = label
+                            stack.append(star)
+            label += 1
+        return labels
+
+    def neighbors(self, person):
+        """
+        Returns (movie, person) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_for(person):
+            for star in self.stars_for(movie):
+                neighbors.add((movie, star))
+        return neighbors
+
+    def unvisited_neighbors(self, person, visited, expanded):
+        """
+        Yields (movie, person) pairs for people who starred with a given
+        person and are not in visited, skipping movies in expanded and
+        adding every other movie to it.
+        """
+        offsets = self.person_offsets
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+        for movie in self.person_movies[offsets[person]:offsets[person + 1]]:
+            if movie in expanded:
+                continue
+            expanded.add(movie)
+            for star in movie_people[movie_offsets[movie]:
+                                     movie_offsets[movie + 1]]:
+                if star not in visited:
+                    yield movie, star
+
+    def path_ids(self, path):
+        """
+        Translates a path of (movie, person) pairs back to string ids.
+        """
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person])
+                for movie, person in path]
+
+
+def csr(size, sources, targets):
+    """
+    Returns the offset and neighbor arrays of the edges
+    from sources to targets, over `size` source vertices.
+    """
+    offsets = array("q", bytes(8 * (size + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+
+    neighbors = array("i", bytes(4 * len(targets)))
+    position = offsets[:-1]
+    for source, target in zip(sources, targets):
+        neighbors[position[source]] = target
+        position[source] += 1
+    return offsets, neighbors
+
+
+class PeopleView(Mapping):
+    """
+    Read-only view of a CompactGraph with the same shape as the `people`
+    dictionary: person_ids map to a dictionary of name, birth and movies.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, person_id):
+        graph = self.graph
+        person = graph.person_index[person_id]
+        return {
+            "name": graph.person_names[person],
+            "birth": graph.person_births[person],
+            "movies": {graph.movie_ids[movie]
+                       for movie in graph.movies_for(person)}
+        }
+
+    def __contains__(self, person_id):
+        return person_id in self.graph.person_index
+
+    def __iter__(self):
+        return iter(self.graph.person_ids)
+
+    def __len__(self):
+        return len(self.graph.person_ids)
+
+
+class MoviesView(Mapping):
+    """
+    Read-only view of a CompactGraph with the same shape as the `movies`
+    dictionary: movie_ids map to a dictionary of title, year and stars.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, movie_id):
+        graph = self.graph
+        movie = graph.movie_index[movie_id]
+        return {
+            "title": graph.movie_titles[movie],
+            "year": graph.movie_years[movie],
+            "stars": {graph.person_ids[person]
+                      for person in graph.stars_for(movie)}
+        }
+
+    def __contains__(self, movie_id):
+        return movie_id in self.graph.movie_index
+
+    def __iter__(self):
+        return iter(self.graph.movie_ids)
+
+    def __len__(self):
+        return len(self.graph.movie_ids)
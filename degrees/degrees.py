@@ -1,7 +1,9 @@
 import csv
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+import snapshot
+from compact import CompactGraph, PeopleView, MoviesView
+from util import Node, DequeQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +14,33 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Maps person_ids to the label of their connected component
+components = {}
 
-def load_data(directory):
+# Compact integer-indexed graph behind `people` and `movies`, if loaded
+graph = None
+
+# Command-line switches accepted by main
+OPTIONS = {"--bidirectional", "--compact"}
+
+
+def load_data(directory, compact=False):
     """
     Load data from CSV files into memory.
+
+    If compact is True, the star graph is kept in a CompactGraph and
+    `people` and `movies` become read-only views of it. A snapshot of the
+    directory that is newer than its CSV files is mapped instead of
+    parsing them, and always loads in compact form.
     """
+    mapped = snapshot.load(directory)
+    if mapped is not None:
+        use_graph(mapped)
+        return
+    if compact:
+        use_graph(CompactGraph.from_csv(directory))
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -51,15 +75,71 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    components.update(label_components())
+
+
+def label_components():
+    """
+    Returns a dictionary labelling every person_id with the index
+    of the connected component they belong to.
+    """
+    labels = {}
+    seen = set()
+    for label, person_id in enumerate(people):
+        if person_id in labels:
+            continue
+        labels[person_id] = label
+        stack = [person_id]
+        while stack:
+            for movie_id in people[stack.pop()]["movies"]:
+                if movie_id in seen:
+                    continue
+                seen.add(movie_id)
+                for star in movies[movie_id]["stars"]:
+                    if star not in labels:
+                        labels[star] = label
+                        stack.append(star)
+    return labels
+
+
+def connected(source, target):
+    """
+    Returns True if a path may connect the source to the target,
+    and False if they lie in different connected components.
+    """
+    if graph is not None:
+        return (graph.components[graph.person_index[source]]
+                == graph.components[graph.person_index[target]])
+    return components[source] == components[target]
+
+
+def use_graph(compact_graph):
+    """
+    Makes a CompactGraph back the `names`, `people` and `movies` indexes.
+    """
+    global graph, people, movies
+    graph = compact_graph
+    people = PeopleView(graph)
+    movies = MoviesView(graph)
+    for person_id, name in zip(graph.person_ids, graph.person_names):
+        if name.lower() not in names:
+            names[name.lower()] = {person_id}
+        else:
+            names[name.lower()].add(person_id)
+
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if len(args) > 1 or any(option not in OPTIONS for option in options):
+        sys.exit("Usage: python degrees.py [--bidirectional] [--compact] "
+                 "[directory]")
+    directory = args[0] if args else "large"
+    bidirectional = "--bidirectional" in options
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(directory, compact="--compact" in options)
     print("Data loaded.")
     
     source = person_id_for_name(input("Name: "))
@@ -69,7 +149,7 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, bidirectional=bidirectional)
 
     if path is None:
         print("Not connected.")
@@ -84,45 +164,216 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+    If bidirectional is True, searches from both ends at once.
     """
+    if not connected(source, target):
+        return None
 
+    search = bidirectional_path if bidirectional else breadth_first_path
+    if graph is None:
+        return search(source, target, unvisited_neighbors)
+
+    # Search the compact graph directly, on dense integers
+    path = search(graph.person_index[source], graph.person_index[target],
+                  graph.unvisited_neighbors)
+    return graph.path_ids(path)
+
+
+def breadth_first_path(source, target, neighbors):
+    """
+    Returns the shortest list of (action, state) pairs that connect
+    the source to the target, where neighbors(state, visited, expanded)
+    yields the (action, state) pairs reachable from a state that are not
+    in visited, as unvisited_neighbors does.
+
+    If no possible path, returns None.
+    """
     num_explored = 0
-    explored = set()
 
     if source == target:
         return None
 
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = DequeQueueFrontier()
     frontier.add(start)
 
+    # States that are in the frontier or have been explored
+    reached = {source}
+    expanded = set()
+
     while True:
 
         if frontier.empty():
-            raise None
+            return None
         node = frontier.remove()
         num_explored += 1
 
-        explored.add(node.state)
+        for action, state in neighbors(node.state, reached, expanded):
+            child = Node(state=state, parent=node, action=action)
+            if state == target:
+                actions = list()
+                while child.parent is not None:
+                    actions.append((child.action, child.state))
+                    child = child.parent
+                actions.reverse()
+                return actions
+            reached.add(state)
+            frontier.add(child)
+
+
+def bidirectional_path(source, target, neighbors):
+    """
+    Returns the shortest list of (action, state) pairs that connect
+    the source to the target, growing one breadth-first frontier from
+    each end and always expanding the smaller one. Actions must be
+    symmetric: a state must be a neighbor of each of its neighbors.
+
+    neighbors is called as in breadth_first_path.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return None
+
+    # Maps each reached state to the (action, state) step
+    # that reached it, one map per direction
+    forward = {source: None}
+    backward = {target: None}
+    forward_layer = [source]
+    backward_layer = [target]
+    forward_expanded = set()
+    backward_expanded = set()
 
-        for action, state in neighbors_for_person(node.state):
-            if not frontier.contains_state(state) and state not in explored:
-                child = Node(state=state, parent=node, action=action)
-                if state == target:
-                    actions = list()
-                    while child.parent is not None:
-                        actions.append((child.action, child.state))
-                        child = child.parent
-                    actions.reverse()
-                    return actions
-                frontier.add(child)
+    while forward_layer and backward_layer:
 
+        # Expand a whole layer of the smaller side, so that every meeting
+        # found in this layer yields a path of the same, shortest length
+        if len(forward_layer) <= len(backward_layer):
+            layer, parents, others = forward_layer, forward, backward
+            expanded = forward_expanded
+        else:
+            layer, parents, others = backward_layer, backward, forward
+            expanded = backward_expanded
+
+        meeting = None
+        next_layer = []
+        for state in layer:
+            for action, neighbor in neighbors(state, parents, expanded):
+                parents[neighbor] = (action, state)
+                if neighbor in others:
+                    meeting = neighbor
+                    break
+                next_layer.append(neighbor)
+            if meeting is not None:
+                break
+
+        if meeting is not None:
+            return join_paths(forward, backward, meeting)
+
+        if parents is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    return None
+
+
+def join_paths(forward, backward, meeting):
+    """
+    Joins the source half and the target half of a bidirectional search
+    at the meeting state into a list of (action, state) pairs.
+    """
+    path = trace_path(forward, meeting)
+
+    state = meeting
+    while backward[state] is not None:
+        action, child = backward[state]
+        path.append((action, child))
+        state = child
+    return path
+
+
+def shortest_paths(source, targets):
+    """
+    Returns a dictionary mapping each of the targets to the shortest list
+    of (movie_id, person_id) pairs that connect the source to it, or to
+    None if there is no possible path, from a single search.
+    """
+    paths = {target: None for target in targets}
+    targets = [target for target in targets if connected(source, target)]
+    if not targets:
+        return paths
+
+    if graph is None:
+        paths.update(breadth_first_paths(source, targets, unvisited_neighbors))
+        return paths
+
+    found = breadth_first_paths(
+        graph.person_index[source],
+        [graph.person_index[target] for target in targets],
+        graph.unvisited_neighbors
+    )
+    paths.update({graph.person_ids[target]: graph.path_ids(path)
+                  for target, path in found.items()})
+    return paths
+
+
+def breadth_first_paths(source, targets, neighbors):
+    """
+    Returns a dictionary mapping each of the targets to the shortest list
+    of (action, state) pairs that connect the source to it, or to None,
+    growing one breadth-first tree until it has reached every target.
+
+    neighbors is called as in breadth_first_path.
+    """
+    parents = {source: None}
+    remaining = set(targets) - {source}
+    layer = [source]
+    expanded = set()
+
+    while layer and remaining:
+        next_layer = []
+        for state in layer:
+            for action, neighbor in neighbors(state, parents, expanded):
+                parents[neighbor] = (action, state)
+                remaining.discard(neighbor)
+                next_layer.append(neighbor)
+            if not remaining:
+                break
+        layer = next_layer
+
+    return {
+        target: trace_path(parents, target)
+        if target in parents and target != source else None
+        for target in targets
+    }
+
+
+def trace_path(parents, state):
+    """
+    Follows the (action, state) steps recorded in parents back from a
+    state to the root, and returns them as a path from the root.
+    """
+    path = []
+    while parents[state] is not None:
+        action, parent = parents[state]
+        path.append((action, state))
+        state = parent
+    path.reverse()
+    return path
+
+
+def person_ids_for_name(name):
+    """
+    Returns the IMDB ids of every person with a given name.
+    """
+    return list(names.get(name.lower(), set()))
 
 
 def person_id_for_name(name):
@@ -130,7 +381,7 @@ def person_id_for_name(name):
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    person_ids = person_ids_for_name(name)
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
@@ -156,6 +407,11 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return {(graph.movie_ids[movie], graph.person_ids[person])
+                for movie, person in
+                graph.neighbors(graph.person_index[person_id])}
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
@@ -164,5 +420,23 @@ def neighbors_for_person(person_id):
     return neighbors
 
 
+def unvisited_neighbors(person_id, visited, expanded):
+    """
+    Yields (movie_id, person_id) pairs for people who starred with a given
+    person, one at a time and skipping people in visited before building
+    a pair, so that a search can stop as soon as it sees its target.
+
+    Movies in expanded are skipped, and every other movie is added to it:
+    once a search has expanded a movie, all of its stars are visited.
+    """
+    for movie_id in people[person_id]["movies"]:
+        if movie_id in expanded:
+            continue
+        expanded.add(movie_id)
+        for star in movies[movie_id]["stars"]:
+            if star not in visited:
+                yield movie_id, star
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,66 @@
+import sys
+import time
+
+from util import (
+    Node, StackFrontier, QueueFrontier, DequeStackFrontier, DequeQueueFrontier
+)
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+# List-backed frontiers are quadratic, so they are skipped above this size
+LEGACY_LIMIT = 10 ** 4
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python frontier_benchmark.py [legacy limit]")
+    legacy_limit = int(sys.argv[1]) if len(sys.argv) == 2 else LEGACY_LIMIT
+
+    frontiers = [
+        ("StackFrontier", StackFrontier, True),
+        ("QueueFrontier", QueueFrontier, True),
+        ("DequeStackFrontier", DequeStackFrontier, False),
+        ("DequeQueueFrontier", DequeQueueFrontier, False)
+    ]
+
+    print(f"{'frontier':<20}{'nodes':>10}{'add':>10}{'contains':>10}"
+          f"{'remove':>10}")
+    for n in SIZES:
+        for name, frontier_class, legacy in frontiers:
+            if legacy and n > legacy_limit:
+                print(f"{name:<20}{n:>10}{'skipped':>30}")
+                continue
+            add, contains, remove = benchmark(frontier_class, n)
+            print(f"{name:<20}{n:>10}{add:>10.3f}{contains:>10.3f}"
+                  f"{remove:>10.3f}")
+
+
+def benchmark(frontier_class, n):
+    """
+    Returns the seconds taken to add n nodes to a new frontier,
+    to test n states for membership (half of them absent),
+    and to remove every node again.
+    """
+    frontier = frontier_class()
+    nodes = [Node(state=i, parent=None, action=None) for i in range(n)]
+
+    start = time.perf_counter()
+    for node in nodes:
+        frontier.add(node)
+    add = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for state in range(n // 2, n + n // 2):
+        frontier.contains_state(state)
+    contains = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while not frontier.empty():
+        frontier.remove()
+    remove = time.perf_counter() - start
+
+    return add, contains, remove
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import heapq
+import random
+import sys
+import time
+from array import array
+
+import degrees
+
+# Distance stored for people a landmark cannot reach
+UNREACHABLE = 255
+
+# Command-line switches accepted by main
+OPTIONS = {"--compact"}
+
+
+class LandmarkIndex():
+    """
+    Breadth-first distances from k well-connected landmark people.
+
+    By the triangle inequality, the distance between any two people lies
+    between the largest difference and the smallest sum of their
+    distances to a common landmark, so bounds need no search at all.
+    """
+
+    def __init__(self, landmarks, index, distances):
+        self.landmarks = landmarks
+        self.index = index
+
+        # Distances of person i to every landmark, at [i * k:(i + 1) * k]
+        self.distances = distances
+
+    @classmethod
+    def build(cls, k):
+        """
+        Builds an index over the loaded data from
+        the k people with the most co-stars.
+        """
+        people, movies_of, stars_of = graph_accessors()
+        index = index_for_ids()
+        row = int if degrees.graph is not None else index
+
+        def degree(person):
+            return sum(len(stars_of(movie)) for movie in movies_of(person))
+
+        landmarks = heapq.nlargest(k, people, key=degree)
+        size = len(people) * len(landmarks)
+        distances = array("B", [UNREACHABLE]) * size
+        for column, landmark in enumerate(landmarks):
+            for person, distance in bfs_distances(landmark, movies_of,
+                                                  stars_of):
+                distances[row(person) * len(landmarks) + column] = min(
+                    distance, UNREACHABLE - 1
+                )
+
+        if degrees.graph is not None:
+            landmarks = [degrees.graph.person_ids[landmark]
+                         for landmark in landmarks]
+        return cls(landmarks, index, distances)
+
+    def row(self, person_id):
+        """
+        Returns the distances from a person to every landmark.
+        """
+        k = len(self.landmarks)
+        start = self.index(person_id) * k
+        return self.distances[start:start + k]
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        the source and the target. upper is None if no landmark reaches
+        both, and both are None if they are not connected.
+        """
+        if source == target:
+            return 0, 0
+        if not degrees.connected(source, target):
+            return None, None
+
+        lower, upper = 1, None
+        for to_source, to_target in zip(self.row(source), self.row(target)):
+            if to_source == UNREACHABLE or to_target == UNREACHABLE:
+                continue
+            lower = max(lower, abs(to_source - to_target))
+            if upper is None or to_source + to_target < upper:
+                upper = to_source + to_target
+        return lower, upper
+
+    def degrees(self, source, target, exact=False):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        the source and the target, or, if exact is True, the exact number
+        from a search, as a (degrees, degrees) pair.
+        """
+        if not exact:
+            return self.bounds(source, target)
+        if source == target:
+            return 0, 0
+        path = degrees.shortest_path(source, target, bidirectional=True)
+        if path is None:
+            return None, None
+        return len(path), len(path)
+
+    def size(self):
+        """
+        Returns the number of bytes held by the distance table.
+        """
+        return len(self.distances) * self.distances.itemsize
+
+
+def graph_accessors():
+    """
+    Returns the people of the loaded data, and functions giving the movies
+    of a person and the stars of a movie, for either representation.
+    """
+    graph = degrees.graph
+    if graph is not None:
+        return range(len(graph.person_ids)), graph.movies_for, graph.stars_for
+
+    return (list(degrees.people),
+            lambda person_id: degrees.people[person_id]["movies"],
+            lambda movie_id: degrees.movies[movie_id]["stars"])
+
+
+def index_for_ids():
+    """
+    Returns a function from a person_id to their row in a distance table.
+    """
+    if degrees.graph is not None:
+        return degrees.graph.person_index.__getitem__
+    index = {person_id: i for i, person_id in enumerate(degrees.people)}
+    return index.__getitem__
+
+
+def bfs_distances(source, movies_of, stars_of):
+    """
+    Yields (person, distance) pairs for every person reachable
+    from the source, in breadth-first order.
+    """
+    seen_people = {source}
+    seen_movies = set()
+    layer = [source]
+    distance = 0
+    while layer:
+        next_layer = []
+        for person in layer:
+            yield person, distance
+            for movie in movies_of(person):
+                if movie in seen_movies:
+                    continue
+                seen_movies.add(movie)
+                for star in stars_of(movie):
+                    if star not in seen_people:
+                        seen_people.add(star)
+                        next_layer.append(star)
+        layer = next_layer
+        distance += 1
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if len(args) > 3 or any(option not in OPTIONS for option in options):
+        sys.exit("Usage: python landmarks.py [--compact] "
+                 "[directory] [landmarks] [samples]")
+    directory = args[0] if args else "large"
+    k = int(args[1]) if len(args) > 1 else 16
+    samples = int(args[2]) if len(args) > 2 else 200
+
+    print("Loading data...")
+    degrees.load_data(directory, compact="--compact" in options)
+    print("Data loaded.")
+
+    start = time.perf_counter()
+    index = LandmarkIndex.build(k)
+    build = time.perf_counter() - start
+    print(f"Built {len(index.landmarks)} landmarks in {build:.2f} s, "
+          f"using {index.size() / 1024:.1f} KiB.")
+
+    # Compare bounds with exact distances between random connected pairs
+    person_ids = list(degrees.people)
+    pairs = []
+    for _ in range(100 * samples):
+        source, target = random.sample(person_ids, 2)
+        if degrees.connected(source, target):
+            pairs.append((source, target))
+        if len(pairs) == samples:
+            break
+    if not pairs:
+        sys.exit("No connected pairs found.")
+
+    exact, gaps, errors, bounded, bound_time = 0, 0, 0, 0, 0
+    for source, target in pairs:
+        start = time.perf_counter()
+        lower, upper = index.bounds(source, target)
+        bound_time += time.perf_counter() - start
+        distance, _ = index.degrees(source, target, exact=True)
+        if upper is None:
+            continue
+        bounded += 1
+        exact += lower == upper
+        gaps += upper - lower
+        errors += upper - distance
+
+    print(f"Bounds per pair: {1e6 * bound_time / len(pairs):.1f} µs.")
+    print(f"No upper bound: {len(pairs) - bounded} of {len(pairs)} pairs.")
+    if bounded:
+        print(f"Exact bounds: {exact} of {bounded} pairs.")
+        print(f"Mean upper - lower: {gaps / bounded:.2f} degrees.")
+        print(f"Mean upper - exact: {errors / bounded:.2f} degrees.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch import read_pairs
+from client import URL, request
+
+# Settings accepted by main as --name=value, with their defaults
+SETTINGS = {"--url": URL, "--concurrency": "16", "--requests": "1000"}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    settings = dict(SETTINGS)
+    for option in sys.argv[1:]:
+        if not option.startswith("--"):
+            continue
+        name, _, value = option.partition("=")
+        if name not in settings or not value:
+            sys.exit("Usage: python loadtest.py [--url=URL] "
+                     "[--concurrency=N] [--requests=N] queries")
+        settings[name] = value
+    if len(args) != 1:
+        sys.exit("Usage: python loadtest.py [--url=URL] "
+                 "[--concurrency=N] [--requests=N] queries")
+    url = settings["--url"]
+    concurrency = int(settings["--concurrency"])
+    requests = int(settings["--requests"])
+
+    # Resolve names up front, so that only path requests are timed
+    with open(args[0], encoding="utf-8") as f:
+        pairs = read_pairs(f)
+    queries = []
+    for source, target in pairs:
+        source_id = person_id_for_name(url, source)
+        target_id = person_id_for_name(url, target)
+        if source_id is not None and target_id is not None:
+            queries.append((source_id, target_id))
+    if not queries:
+        sys.exit("No query names a single known person on both sides.")
+
+    # Draw requests from the queries, so that repeats exercise the cache
+    queries = [random.choice(queries) for _ in range(requests)]
+
+    def timed(query):
+        start = time.perf_counter()
+        request(url, "/path", source=query[0], target=query[1])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, queries))
+    elapsed = time.perf_counter() - start
+
+    print(f"{requests} requests, {concurrency} concurrent, "
+          f"{requests / elapsed:.0f} requests/s")
+    for name, fraction in [("p50", 0.5), ("p90", 0.9), ("p99", 0.99)]:
+        latency = percentile(latencies, fraction)
+        print(f"{name}: {1000 * latency:.2f} ms")
+    print(f"max: {1000 * latencies[-1]:.2f} ms")
+    stats = request(url, "/stats")
+    print(f"cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['size']} of {stats['capacity']} entries")
+
+
+def person_id_for_name(url, name):
+    """
+    Returns the IMDB id for a name that belongs to exactly one person.
+    """
+    people = request(url, "/person", name=name)["people"]
+    if len(people) != 1:
+        return None
+    return people[0]["id"]
+
+
+def percentile(values, fraction):
+    """
+    Returns the value at a fraction of the way through sorted values.
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+if __name__ == "__main__":
+    main()
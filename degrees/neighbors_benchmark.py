@@ -0,0 +1,89 @@
+import random
+import sys
+import time
+
+import degrees
+
+# Command-line switches accepted by main
+OPTIONS = {"--compact"}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if len(args) > 2 or any(option not in OPTIONS for option in options):
+        sys.exit("Usage: python neighbors_benchmark.py [--compact] "
+                 "[directory] [queries]")
+    directory = args[0] if args else "large"
+    queries = int(args[1]) if len(args) == 2 else 100
+
+    print("Loading data...")
+    degrees.load_data(directory, compact="--compact" in options)
+    print("Data loaded.")
+
+    # Random pairs that are connected, so that every search finds a path
+    person_ids = list(degrees.people)
+    pairs = []
+    for _ in range(100 * queries):
+        source, target = random.sample(person_ids, 2)
+        if degrees.connected(source, target):
+            pairs.append((source, target))
+        if len(pairs) == queries:
+            break
+    if not pairs:
+        sys.exit("No connected pairs found.")
+
+    graph = degrees.graph
+    if graph is not None:
+        pairs = [(graph.person_index[source], graph.person_index[target])
+                 for source, target in pairs]
+        eager, lazy = graph.neighbors, graph.unvisited_neighbors
+    else:
+        eager, lazy = degrees.neighbors_for_person, degrees.unvisited_neighbors
+
+    print(f"{'neighbors':<12}{'search':<20}{'seconds':>10}"
+          f"{'pairs built':>14}")
+    for search in [degrees.breadth_first_path, degrees.bidirectional_path]:
+        for name, wrap, neighbors in [("set", from_set, eager),
+                                      ("generator", from_generator, lazy)]:
+            count = [0]
+            counted = wrap(neighbors, count)
+            start = time.perf_counter()
+            for source, target in pairs:
+                search(source, target, counted)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12}{search.__name__:<20}{elapsed:>10.3f}"
+                  f"{count[0]:>14}")
+
+
+def from_set(neighbors, count):
+    """
+    Adapts a function returning the set of every (action, state) pair
+    to the calling convention of the searches, counting in count[0]
+    the pairs it builds. Like the original searches, it checks each
+    pair against visited only when the search reaches it, and ignores
+    expanded.
+    """
+    def adapted(state, visited, expanded):
+        pairs = neighbors(state)
+        count[0] += len(pairs)
+        for pair in pairs:
+            if pair[1] not in visited:
+                yield pair
+    return adapted
+
+
+def from_generator(neighbors, count):
+    """
+    Wraps a generator of unvisited (action, state) pairs,
+    counting in count[0] the pairs it builds.
+    """
+    def counted(state, visited, expanded):
+        for pair in neighbors(state, visited, expanded):
+            count[0] += 1
+            yield pair
+    return counted
+
+
+if __name__ == "__main__":
+    main()
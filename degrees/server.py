@@ -0,0 +1,164 @@
+import functools
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import degrees
+
+PORT = 8000
+
+# Number of (source, target) results kept in the cache by default
+CACHE_SIZE = 100000
+
+# Number of connections the socket queues while every thread is busy;
+# socketserver's default of 5 drops clients beyond that, which then
+# retry a second later
+BACKLOG = 128
+
+# Command-line switches accepted by main, besides --port=, --cache=
+# and --backlog=
+OPTIONS = {"--compact"}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    values = {"--port": PORT, "--cache": CACHE_SIZE, "--backlog": BACKLOG}
+    flags = []
+    for option in options:
+        name, _, value = option.partition("=")
+        if name in values and value.isdigit():
+            values[name] = int(value)
+        elif option in OPTIONS:
+            flags.append(option)
+        else:
+            sys.exit("Usage: python server.py [--compact] [--port=N] "
+                     "[--cache=N] [--backlog=N] [directory]")
+    if len(args) > 1:
+        sys.exit("Usage: python server.py [--compact] [--port=N] "
+                 "[--cache=N] [--backlog=N] [directory]")
+    directory = args[0] if args else "large"
+
+    # Load data from files into memory, once for every request
+    print("Loading data...")
+    degrees.load_data(directory, compact="--compact" in flags)
+    print("Data loaded.")
+
+    server = Server(("127.0.0.1", values["--port"]), Handler,
+                    backlog=values["--backlog"])
+    server.cached_path = functools.lru_cache(maxsize=values["--cache"])(
+        find_path
+    )
+    print(f"Serving on http://127.0.0.1:{values['--port']}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def find_path(source, target):
+    """
+    Returns the response to a path request between two person_ids.
+    """
+    path = degrees.shortest_path(source, target, bidirectional=True)
+    response = {
+        "source": source,
+        "target": target,
+        "source_name": degrees.people[source]["name"]
+    }
+    if path is None:
+        response.update({"degrees": None, "path": None})
+        return response
+
+    response["degrees"] = len(path)
+    response["path"] = [{
+        "movie_id": movie_id,
+        "title": degrees.movies[movie_id]["title"],
+        "person_id": person_id,
+        "name": degrees.people[person_id]["name"]
+    } for movie_id, person_id in path]
+    return response
+
+
+def find_people(name):
+    """
+    Returns the response to a lookup of every person with a name.
+    """
+    people = []
+    for person_id in degrees.person_ids_for_name(name):
+        person = degrees.people[person_id]
+        people.append({
+            "id": person_id,
+            "name": person["name"],
+            "birth": person["birth"]
+        })
+    return {"name": name, "people": people}
+
+
+class Server(ThreadingHTTPServer):
+    """
+    Threading HTTP server whose listening socket queues up to backlog
+    pending connections.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, backlog=BACKLOG):
+        self.request_queue_size = backlog
+        super().__init__(address, handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Answers JSON requests for /person?name=..., /path?source=...&target=...
+    and /stats.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/person":
+            if "name" not in query:
+                return self.reply(400, {"error": "Missing name."})
+            return self.reply(200, find_people(query["name"]))
+
+        if url.path == "/path":
+            source, target = query.get("source"), query.get("target")
+            if source is None or target is None:
+                return self.reply(400, {"error": "Missing source or target."})
+            for person_id in (source, target):
+                if person_id not in degrees.people:
+                    return self.reply(
+                        404, {"error": f"Person not found: {person_id}"}
+                    )
+            return self.reply(200, self.server.cached_path(source, target))
+
+        if url.path == "/stats":
+            info = self.server.cached_path.cache_info()
+            return self.reply(200, {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "capacity": info.maxsize
+            })
+
+        self.reply(404, {"error": "Not found."})
+
+    def reply(self, status, response):
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    main()
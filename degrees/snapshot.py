@@ -0,0 +1,136 @@
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from compact import CompactGraph
+
+# Name of the snapshot file, written next to the CSV files it was built from
+SNAPSHOT = "degrees.snapshot"
+
+MAGIC = b"DEGREES\0"
+VERSION = 2
+
+# CSV files whose modification times a snapshot records
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+# Magic, version, then the mtime of every source in nanoseconds
+HEADER = struct.Struct(f"<8sI{len(SOURCES)}q")
+
+# Array sections of a snapshot, in file order, with their typecodes
+ARRAYS = [
+    ("person_offsets", "q"),
+    ("person_movies", "i"),
+    ("movie_offsets", "q"),
+    ("movie_people", "i"),
+    ("components", "i")
+]
+
+# Byte offset and length of every array section, then of the metadata
+TABLE = struct.Struct(f"<{2 * (len(ARRAYS) + 1)}q")
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python snapshot.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    print("Loading data...")
+    graph = CompactGraph.from_csv(directory)
+    path = write(directory, graph)
+    print(f"Snapshot written to {path}.")
+
+
+def source_mtimes(directory):
+    """
+    Returns the modification times of the CSV files in a directory,
+    or None if any of them is missing.
+    """
+    try:
+        return [os.stat(os.path.join(directory, source)).st_mtime_ns
+                for source in SOURCES]
+    except OSError:
+        return None
+
+
+def write(directory, graph):
+    """
+    Writes a snapshot of a CompactGraph loaded from a directory,
+    and returns the path it was written to.
+    """
+    mtimes = source_mtimes(directory)
+    if mtimes is None:
+        raise ValueError(f"{directory} is missing a CSV file")
+
+    metadata = marshal.dumps((
+        graph.person_ids, graph.person_names, graph.person_births,
+        graph.movie_ids, graph.movie_titles, graph.movie_years
+    ))
+    sections = [getattr(graph, name).tobytes() for name, _ in ARRAYS]
+    sections.append(metadata)
+
+    # Lay the sections out after the header, each aligned to 8 bytes
+    table = []
+    offset = HEADER.size + TABLE.size
+    for section in sections:
+        offset += -offset % 8
+        table.extend([offset, len(section)])
+        offset += len(section)
+
+    path = os.path.join(directory, SNAPSHOT)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, *mtimes))
+        f.write(TABLE.pack(*table))
+        for section, start in zip(sections, table[::2]):
+            f.write(bytes(start - f.tell()))
+            f.write(section)
+    os.replace(temporary, path)
+    return path
+
+
+def load(directory):
+    """
+    Returns the CompactGraph stored in a directory's snapshot, with its
+    arrays memory-mapped from the file. Returns None if there is no
+    snapshot, if it is damaged, or if the CSV files have changed since
+    it was written.
+    """
+    path = os.path.join(directory, SNAPSHOT)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        with f:
+            contents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, *mtimes = HEADER.unpack_from(contents)
+        if (magic != MAGIC or version != VERSION
+                or mtimes != source_mtimes(directory)):
+            return None
+
+        # Every section must lie within the file
+        table = TABLE.unpack_from(contents, HEADER.size)
+        sections = list(zip(table[0::2], table[1::2]))
+        if any(start < HEADER.size + TABLE.size
+               or start + length > len(contents)
+               for start, length in sections):
+            return None
+
+        view = memoryview(contents)
+        arrays = [
+            view[start:start + length].cast(typecode)
+            for (_, typecode), (start, length) in zip(ARRAYS, sections)
+        ]
+        start, length = sections[-1]
+        metadata = marshal.loads(view[start:start + length])
+        return CompactGraph(*metadata, *arrays)
+    except (OSError, ValueError, TypeError, EOFError, MemoryError,
+            struct.error):
+        return None
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,104 @@
+import collections
 import itertools
+import weakref
+
+from sat import CNF, Solver
+
+# Number of symbols whose assignments model_check_bitset
+# enumerates together, as the bits of one integer
+BATCH_SYMBOLS = 20
+
+# Every sentence in use, by its class and parts, so that
+# structurally equal sentences are one and the same object
+interned = weakref.WeakValueDictionary()
 
 
 class Sentence():
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+    @classmethod
+    def intern(cls, symbols, **parts):
+        """
+        Returns the sentence of this class made of parts, creating it
+        only if no equal sentence exists yet. Sentences are immutable,
+        so each keeps its hash and symbols from when it was created.
+        """
+        key = (cls, *parts.values())
+        sentence = interned.get(key)
+        if sentence is None:
+            sentence = object.__new__(cls)
+            for name, value in parts.items():
+                object.__setattr__(sentence, name, value)
+            object.__setattr__(sentence, "_hash", hash(key))
+            object.__setattr__(sentence, "_symbols", symbols)
+            interned[key] = sentence
+        return sentence
+
+    # Equal sentences are interned, so equality is identity
+    def __hash__(self):
+        return self._hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError("sentences are immutable")
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
 
+    def evaluate_partial(self, model):
+        """
+        Evaluates the logical sentence in a model that may leave symbols
+        unassigned: returns True or False if the sentence has that value
+        whatever the unassigned symbols are, and None if it depends on them.
+        """
+        raise Exception("nothing to evaluate")
+
+    def children(self):
+        """Returns the sentences the logical sentence is made of."""
+        return ()
+
     def formula(self):
         """Returns string formula representing logical sentence."""
         return ""
 
+    def bitset(self, columns, full):
+        """
+        Evaluates the logical sentence in many models at once.
+
+        Bit m of columns[name] is the value of symbol name in model m,
+        and bit m of the result is the value of the sentence in it;
+        full has a bit set for every model.
+        """
+        raise Exception("nothing to evaluate")
+
+    def to_cnf(self, cnf=None):
+        """
+        Returns a CNF that is satisfiable exactly when the logical
+        sentence is, by the Tseitin transform: one new variable per
+        connective, with clauses making it equivalent to the connective.
+        The clauses are added to cnf, if given.
+        """
+        if cnf is None:
+            cnf = CNF()
+        cnf.add([self.literal(cnf)])
+        return cnf
+
+    def literal(self, cnf):
+        """
+        Returns a literal of cnf equivalent to the logical sentence,
+        adding the clauses that define it the first time.
+        """
+        if self not in cnf.literals:
+            cnf.literals[self] = self.tseitin(cnf)
+        return cnf.literals[self]
+
+    def tseitin(self, cnf):
+        """Adds clauses defining a literal equivalent to the sentence."""
+        raise Exception("nothing to encode")
+
     def symbols(self):
-        """Returns a set of all symbols in the logical sentence."""
-        return set()
+        """Returns a frozen set of all symbols in the logical sentence."""
+        return self._symbols
 
     @classmethod
     def validate(cls, sentence):
@@ -43,15 +128,10 @@ class Sentence():
 
 
 class Symbol(Sentence):
+    __slots__ = ("name",)
 
-    def __init__(self, name):
-        self.name = name
-
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
-
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    def __new__(cls, name):
+        return cls.intern(frozenset([name]), name=name)
 
     def __repr__(self):
         return self.name
@@ -62,23 +142,29 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
+    def evaluate_partial(self, model):
+        value = model.get(self.name)
+        return None if value is None else bool(value)
+
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def bitset(self, columns, full):
+        try:
+            return columns[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
 
+    def tseitin(self, cnf):
+        return cnf.variable(self.name)
 
-class Not(Sentence):
-    def __init__(self, operand):
-        Sentence.validate(operand)
-        self.operand = operand
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+class Not(Sentence):
+    __slots__ = ("operand",)
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def __new__(cls, operand):
+        Sentence.validate(operand)
+        return cls.intern(operand.symbols(), operand=operand)
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -86,26 +172,33 @@ class Not(Sentence):
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def evaluate_partial(self, model):
+        value = self.operand.evaluate_partial(model)
+        return None if value is None else not value
+
+    def children(self):
+        return (self.operand,)
+
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def bitset(self, columns, full):
+        return full & ~self.operand.bitset(columns, full)
+
+    def tseitin(self, cnf):
+        return -self.operand.literal(cnf)
 
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
-
-    def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
-
-    def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
+        symbols = frozenset().union(
+            *[conjunct.symbols() for conjunct in conjuncts]
         )
+        return cls.intern(symbols, conjuncts=conjuncts)
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -113,36 +206,57 @@ class And(Sentence):
         )
         return f"And({conjunctions})"
 
-    def add(self, conjunct):
-        Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
-
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def evaluate_partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.evaluate_partial(model)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+
+    def children(self):
+        return self.conjuncts
+
+    def bitset(self, columns, full):
+        bits = full
+        for conjunct in self.conjuncts:
+            bits &= conjunct.bitset(columns, full)
+            if not bits:
+                break
+        return bits
+
+    def tseitin(self, cnf):
+        if not self.conjuncts:
+            return cnf.true()
+        literals = [conjunct.literal(cnf) for conjunct in self.conjuncts]
+        v = cnf.new_variable()
+        for literal in literals:
+            cnf.add([-v, literal])
+        cnf.add([v] + [-literal for literal in literals])
+        return v
+
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
-
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
-
-    def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
-
-    def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
+        symbols = frozenset().union(
+            *[disjunct.symbols() for disjunct in disjuncts]
         )
+        return cls.intern(symbols, disjuncts=disjuncts)
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -151,30 +265,53 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def evaluate_partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.evaluate_partial(model)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+    def children(self):
+        return self.disjuncts
+
+    def bitset(self, columns, full):
+        bits = 0
+        for disjunct in self.disjuncts:
+            bits |= disjunct.bitset(columns, full)
+            if bits == full:
+                break
+        return bits
+
+    def tseitin(self, cnf):
+        if not self.disjuncts:
+            return -cnf.true()
+        literals = [disjunct.literal(cnf) for disjunct in self.disjuncts]
+        v = cnf.new_variable()
+        for literal in literals:
+            cnf.add([v, -literal])
+        cnf.add([-v] + literals)
+        return v
+
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
-
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
-
-    def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
-
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+        symbols = antecedent.symbols() | consequent.symbols()
+        return cls.intern(symbols, antecedent=antecedent,
+                          consequent=consequent)
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -183,29 +320,47 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def evaluate_partial(self, model):
+        antecedent = self.antecedent.evaluate_partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.evaluate_partial(model)
+        if consequent is True:
+            return True
+        if antecedent is True and consequent is False:
+            return False
+        return None
+
+    def children(self):
+        return (self.antecedent, self.consequent)
+
+    def bitset(self, columns, full):
+        return ((full & ~self.antecedent.bitset(columns, full))
+                | self.consequent.bitset(columns, full))
+
+    def tseitin(self, cnf):
+        a = self.antecedent.literal(cnf)
+        c = self.consequent.literal(cnf)
+        v = cnf.new_variable()
+        cnf.add([-v, -a, c])
+        cnf.add([v, a])
+        cnf.add([v, -c])
+        return v
+
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
-
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
-
-    def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
-
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+        symbols = left.symbols() | right.symbols()
+        return cls.intern(symbols, left=left, right=right)
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -216,23 +371,57 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def evaluate_partial(self, model):
+        left = self.left.evaluate_partial(model)
+        if left is None:
+            return None
+        right = self.right.evaluate_partial(model)
+        if right is None:
+            return None
+        return left == right
+
+    def children(self):
+        return (self.left, self.right)
+
+    def bitset(self, columns, full):
+        return full & ~(self.left.bitset(columns, full)
+                        ^ self.right.bitset(columns, full))
+
+    def tseitin(self, cnf):
+        left = self.left.literal(cnf)
+        right = self.right.literal(cnf)
+        v = cnf.new_variable()
+        cnf.add([-v, -left, right])
+        cnf.add([-v, left, -right])
+        cnf.add([v, left, right])
+        cnf.add([v, -left, -right])
+        return v
+
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
 
+def model_check(knowledge, query, stats=None):
+    """
+    Checks if knowledge base entails query.
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    If stats is a dict, adds to stats["models"] the number of complete
+    models checked and to stats["pruned"] the number of partial models
+    whose every completion was settled without being checked.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("models", 0)
+    stats.setdefault("pruned", 0)
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
 
         # If model has an assignment for each symbol
         if not symbols:
+            stats["models"] += 1
 
             # If knowledge base is true in model, then query must also be true
             if knowledge.evaluate(model):
@@ -240,9 +429,18 @@ def model_check(knowledge, query):
             return True
         else:
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
+            # Stop as soon as the partial model settles entailment
+            # for every assignment of the remaining symbols
+            known = knowledge.evaluate_partial(model)
+            answer = query.evaluate_partial(model)
+            if known is False or answer is True:
+                stats["pruned"] += 1
+                return True
+            if known is True and answer is False:
+                return False
+
+            # Choose the most frequent of the remaining unused symbols
+            p, remaining = symbols[0], symbols[1:]
 
             # Create a model where the symbol is true
             model_true = model.copy()
@@ -256,8 +454,121 @@ def model_check(knowledge, query):
             return (check_all(knowledge, query, remaining, model_true) and
                     check_all(knowledge, query, remaining, model_false))
 
-    # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    # Get all symbols in both knowledge and query, most frequent first
+    counts = occurrences(knowledge) + occurrences(query)
+    symbols = sorted(knowledge.symbols() | query.symbols(),
+                     key=lambda symbol: -counts[symbol])
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def occurrences(sentence):
+    """Returns a Counter of the occurrences of each symbol in a sentence."""
+    counts = collections.Counter()
+    stack = [sentence]
+    while stack:
+        sentence = stack.pop()
+        if isinstance(sentence, Symbol):
+            counts[sentence.name] += 1
+        else:
+            stack.extend(sentence.children())
+    return counts
+
+
+def model_check_bitset(knowledge, query):
+    """
+    Checks if knowledge base entails query, like model_check, but
+    evaluating the sentences over 2 ** BATCH_SYMBOLS models at a time,
+    with one bit of an integer per model.
+    """
+
+    # Get all symbols in both knowledge and query, in a fixed order
+    symbols = sorted(knowledge.symbols() | query.symbols())
+    batched, fixed = symbols[:BATCH_SYMBOLS], symbols[BATCH_SYMBOLS:]
+
+    # Bit m of the column of the i-th batched symbol is bit i of m,
+    # so the column repeats runs of 2 ** i zeros then 2 ** i ones
+    models = 1 << len(batched)
+    full = (1 << models) - 1
+    columns = {}
+    for i, symbol in enumerate(batched):
+        run = 1 << i
+        column = ((1 << run) - 1) << run
+        period = 2 * run
+        while period < models:
+            column |= column << period
+            period *= 2
+        columns[symbol] = column
+
+    # Enumerate the assignments of the remaining symbols one batch at a time
+    for values in itertools.product([0, full], repeat=len(fixed)):
+        columns.update(zip(fixed, values))
+
+        # The knowledge base must be false wherever the query is
+        counterexamples = knowledge.bitset(columns, full)
+        if counterexamples:
+            counterexamples &= ~query.bitset(columns, full)
+        if counterexamples:
+            return False
+    return True
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, by asking a SAT solver
+    whether knowledge base and not query can both be true.
+    """
+    cnf = knowledge.to_cnf()
+    cnf.add([-query.literal(cnf)])
+    return not Solver(cnf).solve()
+
+
+class KnowledgeBase():
+    """
+    Knowledge compiled once into a SAT solver that answers many queries,
+    each by solving under the assumption that the query is false.
+    Learned clauses and models found are kept between queries.
+    """
+
+    def __init__(self, *sentences):
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.compiled = 0
+
+        # Models of the knowledge found so far, as lists of variable values
+        self.models = []
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence to the knowledge, without recompiling the rest."""
+        Sentence.validate(sentence)
+        self.solver.add_clause([self.literal(sentence)])
+        self.models = []
+
+    def literal(self, sentence):
+        """
+        Returns the literal of a sentence, passing any clauses that define
+        it on to the solver.
+        """
+        literal = sentence.literal(self.cnf)
+        for clause in self.cnf.clauses[self.compiled:]:
+            self.solver.add_clause(clause)
+        self.compiled = len(self.cnf.clauses)
+        return literal
+
+    def entails(self, query):
+        """Checks if the knowledge entails query."""
+        literal = self.literal(query)
+
+        # A model already found where query is false is a counterexample
+        variable = abs(literal)
+        for model in self.models:
+            if variable < len(model) and model[variable] != (literal > 0):
+                return False
+
+        if self.solver.solve([-literal]):
+            self.models.append(self.solver.model)
+            return False
+        return True
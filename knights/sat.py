@@ -0,0 +1,301 @@
+import heapq
+
+
+class CNF():
+    """
+    Conjunctive normal form: a list of clauses, each a list of non-zero
+    integer literals, where -v is the negation of variable v. Symbols
+    are given variables by name; auxiliary variables have no name.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.variables = {}
+        self.count = 0
+
+        # Literal already standing for each sentence encoded so far
+        self.literals = {}
+        self.true_literal = None
+
+    def variable(self, name):
+        """Returns the variable of a symbol, creating it if needed."""
+        if name not in self.variables:
+            self.variables[name] = self.new_variable()
+        return self.variables[name]
+
+    def new_variable(self):
+        """Returns a fresh auxiliary variable."""
+        self.count += 1
+        return self.count
+
+    def true(self):
+        """Returns a literal that is true in every model."""
+        if self.true_literal is None:
+            self.true_literal = self.new_variable()
+            self.add([self.true_literal])
+        return self.true_literal
+
+    def add(self, clause):
+        self.clauses.append(list(clause))
+
+
+class Solver():
+    """
+    CDCL SAT solver: unit propagation over two watched literals per
+    clause, first-UIP clause learning with non-chronological
+    backtracking, activity-ordered decisions with phase saving,
+    and restarts. Clauses may be added between calls to solve.
+    """
+
+    def __init__(self, cnf=None):
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.activity = [0.0]
+        self.phases = [False]
+        self.heap = []
+        self.bump = 1.0
+
+        self.watches = {}
+        self.clauses = []
+        self.learned = []
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.unsatisfiable = False
+        self.stats = {"decisions": 0, "conflicts": 0, "propagations": 0}
+
+        if cnf is not None:
+            self.grow(cnf.count)
+            for clause in cnf.clauses:
+                self.add_clause(clause)
+
+    def grow(self, count):
+        """Makes room for variables up to count."""
+        for variable in range(len(self.values), count + 1):
+            self.values.append(None)
+            self.levels.append(0)
+            self.reasons.append(None)
+            self.activity.append(0.0)
+            self.phases.append(False)
+            heapq.heappush(self.heap, (0.0, variable))
+
+    def value(self, literal):
+        """Returns the value of a literal, or None if it is unassigned."""
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def level(self):
+        return len(self.limits)
+
+    def add_clause(self, clause):
+        """
+        Adds a clause, simplified by the assignments that hold in every
+        model found so far. Returns False if the clauses are now known
+        to be unsatisfiable.
+        """
+        self.backtrack(0)
+        self.grow(max((abs(literal) for literal in clause), default=0))
+
+        literals = []
+        for literal in clause:
+            value = self.value(literal)
+            if value is True or -literal in literals:
+                return not self.unsatisfiable
+            if value is None and literal not in literals:
+                literals.append(literal)
+
+        if not literals:
+            self.unsatisfiable = True
+        elif len(literals) == 1:
+            self.assign(literals[0], None)
+            if self.propagate() is not None:
+                self.unsatisfiable = True
+        else:
+            self.watch(literals)
+            self.clauses.append(literals)
+        return not self.unsatisfiable
+
+    def watch(self, clause):
+        for literal in clause[:2]:
+            self.watches.setdefault(literal, []).append(clause)
+
+    def assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = self.level()
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal implied by unit clauses.
+        Returns a conflicting clause, or None.
+        """
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            self.stats["propagations"] += 1
+            watchers = self.watches.get(false, [])
+            kept = []
+            for i, clause in enumerate(watchers):
+
+                # Keep the false literal second
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+
+                # Watch another literal that is not false, if there is one
+                for j in range(2, len(clause)):
+                    if self.value(clause[j]) is not False:
+                        clause[1], clause[j] = clause[j], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watchers[i + 1:])
+                        self.watches[false] = kept
+                        return clause
+                    self.assign(clause[0], clause)
+            self.watches[false] = kept
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns the first-UIP clause learned from a conflict, with its
+        asserting literal first and a literal of the highest remaining
+        level second, and the level to backtrack to.
+        """
+        learned = [None]
+        seen = set()
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for literal in clause:
+                variable = abs(literal)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump_activity(variable)
+                if self.levels[variable] == self.level():
+                    pending += 1
+                else:
+                    learned.append(literal)
+
+            # Resolve on the latest assigned literal of this level
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+        highest = max(range(1, len(learned)),
+                      key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def bump_activity(self, variable):
+        self.activity[variable] += self.bump
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.bump *= 1e-100
+            self.heap = [(-self.activity[variable], variable)
+                         for variable in range(1, len(self.values))]
+            heapq.heapify(self.heap)
+        elif self.values[variable] is None:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """Undoes every assignment above a decision level."""
+        if self.level() <= level:
+            return
+        for literal in self.trail[self.limits[level]:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[self.limits[level]:]
+        del self.limits[level:]
+        self.head = len(self.trail)
+
+    def decide(self):
+        """
+        Returns the unassigned variable of highest activity,
+        or None if every variable is assigned.
+        """
+        while self.heap:
+            activity, variable = heapq.heappop(self.heap)
+            if self.values[variable] is None:
+                return variable
+        return None
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses, together with the assumed literals,
+        are satisfiable, and stores a satisfying assignment in `model`.
+        """
+        self.model = None
+        if self.unsatisfiable:
+            return False
+        self.backtrack(0)
+        self.grow(max((abs(literal) for literal in assumptions), default=0))
+
+        restart = 100
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.stats["conflicts"] += 1
+                conflicts += 1
+                if self.level() == 0:
+                    self.unsatisfiable = True
+                    return False
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.watch(learned)
+                    self.learned.append(learned)
+                    self.assign(learned[0], learned)
+                self.bump /= 0.95
+                continue
+
+            if conflicts >= restart:
+                conflicts = 0
+                restart = int(restart * 1.5)
+                self.backtrack(0)
+                continue
+
+            # Decide the assumptions first, one level each
+            if self.level() < len(assumptions):
+                literal = assumptions[self.level()]
+                value = self.value(literal)
+                if value is False:
+                    return False
+                self.limits.append(len(self.trail))
+                if value is None:
+                    self.assign(literal, None)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                self.model = list(self.values)
+                return True
+            self.stats["decisions"] += 1
+            self.limits.append(len(self.trail))
+            literal = variable if self.phases[variable] else -variable
+            self.assign(literal, None)
@@ -1,7 +1,10 @@
 import itertools
 import random
+from collections import deque
 from collections.abc import Iterable
 
+import probability
+
 class Minesweeper():
     """
     Minesweeper game representation
@@ -133,126 +136,289 @@ class Sentence():
         if cell in self.cells:
             self.cells.remove(cell)
 
+    def key(self):
+        """
+        Returns a hashable value that identifies self.cells.
+        """
+        return frozenset(self.cells)
 
-class MinesweeperAI():
+    def issubset(self, other):
+        return self.cells <= other.cells
+
+    def difference(self, other):
+        """
+        Returns the sentence about the cells of self not in other,
+        which holds when other's cells are a subset of self's.
+        """
+        return Sentence(self.cells - other.cells, self.count - other.count)
+
+
+class BitSentence(Sentence):
     """
-    Minesweeper game player
+    Sentence whose cells are the set bits of an integer, bit
+    i * width + j standing for cell (i, j), so that subset tests,
+    differences and counts are operations on a single integer.
     """
 
-    def __init__(self, height=8, width=8):
-
-        # Set initial height and width
-        self.height = height
+    def __init__(self, bits, count, width):
+        self.bits = bits
+        self.count = count
         self.width = width
 
-        # Keep track of which cells have been clicked on
-        self.moves_made = set()
+    @classmethod
+    def from_cells(cls, cells, count, width):
+        bits = 0
+        for i, j in cells:
+            bits |= 1 << (i * width + j)
+        return cls(bits, count, width)
+
+    @property
+    def cells(self):
+        cells = set()
+        bits = self.bits
+        while bits:
+            bit = bits & -bits
+            cells.add(divmod(bit.bit_length() - 1, self.width))
+            bits ^= bit
+        return cells
 
-        # Keep track of cells known to be safe or mines
-        self.mines = set()
-        self.safes = set()
+    def __eq__(self, other):
+        return self.bits == other.bits and self.count == other.count
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+    def bit(self, cell):
+        i, j = cell
+        return 1 << (i * self.width + j)
 
-    def mark_mine(self, cell):
-        """
-        Marks a cell as a mine, and updates all knowledge
-        to mark that cell as a mine as well.
-        """
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            if cell in sentence.cells:
-                sentence.mark_mine(cell)
+    def known_mines(self):
+        if self.bits.bit_count() == self.count:
+            return self.cells
+
+    def known_safes(self):
+        if self.count == 0:
+            return self.cells
 
+    def mark_mine(self, cell):
+        bit = self.bit(cell)
+        if self.bits & bit:
+            self.bits ^= bit
+            self.count -= 1
 
     def mark_safe(self, cell):
-        """
-        Marks a cell as safe, and updates all knowledge
-        to mark that cell as safe as well.
-        """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            if cell in sentence.cells:
-                sentence.mark_safe(cell)
+        self.bits &= ~self.bit(cell)
 
-    def analyze_knowledge(self, new_sentence):
-        new_sentence_copy = new_sentence.cells.copy()
-        for cell in new_sentence_copy:
+    def key(self):
+        return self.bits
 
-            if cell in self.safes:
-                new_sentence.mark_safe(cell)
+    def issubset(self, other):
+        return self.bits & ~other.bits == 0
 
-        for cell in new_sentence_copy:
-            if cell in self.mines:
-                new_sentence.mark_mine(cell)
+    def difference(self, other):
+        return BitSentence(self.bits & ~other.bits,
+                           self.count - other.count, self.width)
 
 
-        if isinstance(new_sentence.known_safes(), Iterable):
-            for cell in new_sentence.known_safes():
-                self.mark_safe(cell)
+class Knowledge():
+    """
+    Store of the sentences known to be true, at most one per set of cells,
+    with an index from every cell to the sentences that contain it.
+    """
 
+    def __init__(self):
 
-        if isinstance(new_sentence.known_mines(), Iterable):
-            for cell in new_sentence.known_mines():
-                self.mark_mine(cell)
+        # Sentences by the key of their cells
+        self.sentences = {}
 
-        if not new_sentence in self.knowledge:
-            self.knowledge.append(new_sentence)
+        # Keys of the sentences that contain each cell
+        self.index = {}
 
-            for sentence in self.knowledge:
-                if sentence.cells != new_sentence.cells:
-                    new_sentence_copy = new_sentence.cells.copy
-                    sentence_copy = sentence.cells.copy()
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
 
-                    for cell in sentence_copy:
-                        if cell in self.safes:
-                            sentence.mark_safe(cell)
+    def __len__(self):
+        return len(self.sentences)
 
-                    for cell in sentence_copy:
-                        if cell in self.mines:
-                            sentence.mark_mine(cell)
+    def __contains__(self, sentence):
+        return self.sentences.get(sentence.key()) is sentence
 
+    def add(self, sentence):
+        """
+        Stores a sentence. Returns False, storing nothing, if the sentence
+        has no cells or there already is one about the same cells.
+        """
+        key = sentence.key()
+        if not key or key in self.sentences:
+            return False
+        self.sentences[key] = sentence
+        for cell in sentence.cells:
+            self.index.setdefault(cell, set()).add(key)
+        return True
+
+    def remove(self, sentence):
+        key = sentence.key()
+        del self.sentences[key]
+        for cell in sentence.cells:
+            keys = self.index[cell]
+            keys.discard(key)
+            if not keys:
+                del self.index[cell]
+
+    def containing(self, cell):
+        """
+        Returns the sentences that contain a cell.
+        """
+        return [self.sentences[key] for key in self.index.get(cell, ())]
+
+    def mark_mine(self, cell):
+        """
+        Marks a cell as a mine in the sentences that contain it.
+        Returns the changed sentences that are still stored.
+        """
+        return self.update(cell, mine=True)
+
+    def mark_safe(self, cell):
+        """
+        Marks a cell as safe in the sentences that contain it.
+        Returns the changed sentences that are still stored.
+        """
+        return self.update(cell, mine=False)
+
+    def update(self, cell, mine):
+        changed = []
+        for sentence in self.containing(cell):
+            self.remove(sentence)
+            if mine:
+                sentence.mark_mine(cell)
+            else:
+                sentence.mark_safe(cell)
+            if self.add(sentence):
+                changed.append(sentence)
+        return changed
+
+    def derive(self, sentence):
+        """
+        Stores every sentence that follows from a stored sentence and
+        another one whose cells are a subset or superset of its cells.
+        Returns the new sentences.
+        """
+        if sentence not in self:
+            return []
+
+        # Only sentences sharing a cell can be subsets or supersets
+        overlapping = set()
+        for cell in sentence.cells:
+            overlapping |= self.index[cell]
+        overlapping.discard(sentence.key())
+
+        new = []
+        for key in overlapping:
+            other = self.sentences[key]
+            if other.issubset(sentence):
+                inferred = sentence.difference(other)
+            elif sentence.issubset(other):
+                inferred = other.difference(sentence)
+            else:
+                continue
+            if self.add(inferred):
+                new.append(inferred)
+        return new
 
 
-                    if new_sentence.cells.issubset(sentence.cells):
+class MinesweeperAI():
+    """
+    Minesweeper game player
+    """
+
+    def __init__(self, height=8, width=8, mines=8, time_budget=1.0,
+                 bitset=False):
+
+        # Set initial height, width, and number of mines
+        self.height = height
+        self.width = width
+        self.mine_count = mines
+
+        # Seconds to spend on the probabilities of a random move
+        self.time_budget = time_budget
 
-                        cells = new_sentence.cells.copy()
-                        for cell in cells:
-                            sentence.cells.remove(cell)
-                        sentence.count = sentence.count - new_sentence.count
-                    if sentence.cells.issubset(new_sentence.cells):
-                        cells = sentence.cells.copy()
-                        for cell in cells:
-                            new_sentence.cells.remove(cell)
+        # Whether sentences keep their cells as bits of an integer,
+        # which is faster on large boards
+        self.bitset = bitset
+
+        # Keep track of which cells have been clicked on
+        self.moves_made = set()
 
-                        new_sentence.count = new_sentence.count - sentence.count
+        # Keep track of cells known to be safe or mines
+        self.mines = set()
+        self.safes = set()
 
-                    if isinstance(sentence.known_mines(), Iterable):
-                        cells = sentence.known_mines().copy()
-                        for cell in cells:
-                            self.mark_mine(cell)
+        # The same safe cells and moves as bits, for bitset boards
+        self.safe_bits = 0
+        self.move_bits = 0
 
-                    if isinstance(sentence.known_safes(), Iterable):
-                        cells = sentence.known_safes().copy()
-                        for cell in cells:
-                            self.mark_safe(cell)
+        # Sentences about the game known to be true
+        self.knowledge = Knowledge()
 
-                    if isinstance(new_sentence.known_mines(), Iterable):
-                        cells = new_sentence.known_mines().copy()
-                        for cell in cells:
-                            self.mark_mine(cell)
+        # Cells marked and sentences inferred by the last add_knowledge
+        self.stats = {"mines": 0, "safes": 0, "sentences": 0}
 
-                    if isinstance(new_sentence.known_safes(), Iterable):
-                        cells = new_sentence.known_safes().copy()
-                        for cell in cells:
-                            self.mark_safe(cell)
+    def mark_mine(self, cell):
+        """
+        Marks a cell as a mine, and updates all knowledge
+        to mark that cell as a mine as well.
+        Returns the sentences that changed.
+        """
+        self.mines.add(cell)
+        return self.knowledge.mark_mine(cell)
 
-                self.analyze_knowledge(sentence)
-                self.analyze_knowledge(new_sentence)
+    def mark_safe(self, cell):
+        """
+        Marks a cell as safe, and updates all knowledge
+        to mark that cell as safe as well.
+        Returns the sentences that changed.
+        """
+        self.safes.add(cell)
+        if self.bitset:
+            self.safe_bits |= self.bit(cell)
+        return self.knowledge.mark_safe(cell)
 
+    def bit(self, cell):
+        i, j = cell
+        return 1 << (i * self.width + j)
 
+    def sentence(self, cells, count):
+        """
+        Returns a sentence about cells, in the AI's representation.
+        """
+        if self.bitset:
+            return BitSentence.from_cells(cells, count, self.width)
+        return Sentence(cells, count)
 
+    def analyze_knowledge(self, sentences):
+        """
+        Applies the inference rules to a queue of sentences that are new
+        or have changed, until nothing more can be concluded: a sentence
+        whose cells are all mines or all safe marks them, and any other
+        is compared with the sentences that share a cell with it by the
+        subset rule. Only sentences that change or are inferred go back
+        on the queue, so every sentence is processed once per change.
+        """
+        queue = deque(sentences)
+        while queue:
+            sentence = queue.popleft()
+            if sentence not in self.knowledge:
+                continue
+
+            if isinstance(sentence.known_mines(), Iterable):
+                for cell in sentence.known_mines().copy():
+                    queue.extend(self.mark_mine(cell))
+                    self.stats["mines"] += 1
+            elif isinstance(sentence.known_safes(), Iterable):
+                for cell in sentence.known_safes().copy():
+                    queue.extend(self.mark_safe(cell))
+                    self.stats["safes"] += 1
+            else:
+                inferred = self.knowledge.derive(sentence)
+                queue.extend(inferred)
+                self.stats["sentences"] += len(inferred)
 
     def add_knowledge(self, cell, count):
         """
@@ -268,9 +434,15 @@ class MinesweeperAI():
                if it can be concluded based on the AI's knowledge base
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
+
+        Afterwards, self.stats holds the number of mines and safe cells
+        marked and of sentences inferred.
         """
+        self.stats = {"mines": 0, "safes": 0, "sentences": 0}
         self.moves_made.add(cell)
-        self.mark_safe(cell)
+        if self.bitset:
+            self.move_bits |= self.bit(cell)
+        changed = self.mark_safe(cell)
 
         nearby_cells = set()
         for i in range(cell[0] - 1, cell[0] + 2):
@@ -279,9 +451,14 @@ class MinesweeperAI():
                     continue
                 else:
                     nearby_cells.add((i, j))
-        new_sentence = Sentence(nearby_cells, count)
+        new_sentence = self.sentence(nearby_cells, count)
+        for nearby in nearby_cells:
+            if nearby in self.mines:
+                new_sentence.mark_mine(nearby)
+        if self.knowledge.add(new_sentence):
+            changed.append(new_sentence)
 
-        self.analyze_knowledge(new_sentence)
+        self.analyze_knowledge(changed)
 
     def make_safe_move(self):
         """
@@ -292,6 +469,11 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
+        if self.bitset:
+            pending = self.safe_bits & ~self.move_bits
+            if not pending:
+                return None
+            return divmod((pending & -pending).bit_length() - 1, self.width)
 
         for safe in self.safes:
             if safe not in self.moves_made:
@@ -301,12 +483,19 @@ class MinesweeperAI():
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Should choose among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        the one least likely to be a mine.
         """
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i, j) not in self.moves_made and (i,j) not in self.mines:
-                    return (i, j)
-        return None
+        unknown = [(i, j) for i in range(self.height)
+                   for j in range(self.width)
+                   if (i, j) not in self.moves_made
+                   and (i, j) not in self.mines]
+        if not unknown:
+            return None
+        odds = probability.probabilities(
+            list(self.knowledge), unknown,
+            self.mine_count - len(self.mines), self.time_budget
+        )
+        return min(unknown, key=lambda cell: odds[cell])
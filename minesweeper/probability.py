@@ -0,0 +1,211 @@
+"""
+Mine probabilities for Minesweeper
+
+The cells that appear in the AI's sentences form the frontier. It splits
+into components of cells linked by shared sentences, which constrain each
+other but nothing outside the component. Each component's consistent
+assignments of mines are counted by the number of mines they use, and the
+counts are combined with the number of mines left to place, the rest of
+which may be anywhere among the unknown cells off the frontier.
+"""
+import math
+import time
+
+
+class Timeout(Exception):
+    """Raised inside an enumeration that has run out of time."""
+
+
+def probabilities(sentences, unknown, mines, time_budget=None):
+    """
+    Returns the probability that each unknown cell is a mine, given the
+    sentences about them and the number of mines among them.
+
+    Every cell in a sentence must be in unknown. If the enumeration takes
+    longer than time_budget seconds, returns estimate() instead.
+    """
+    deadline = (None if time_budget is None
+                else time.perf_counter() + time_budget)
+    try:
+        counts = [enumerate_component(cells, constraints, deadline)
+                  for cells, constraints in components(sentences)]
+    except Timeout:
+        return estimate(sentences, unknown, mines)
+
+    frontier = set()
+    for sentence in sentences:
+        frontier |= sentence.cells
+    interior = len(unknown) - len(frontier)
+
+    def weight(k):
+        """Number of ways to place the mines left off the frontier."""
+        if 0 <= mines - k <= interior:
+            return math.comb(interior, mines - k)
+        return 0
+
+    # Numbers of assignments of the whole frontier, by mines used,
+    # and of every component but one, from prefix and suffix products
+    ways = [{k: total for k, (total, _) in table.items()} for table in counts]
+    prefix = [{0: 1}]
+    for table in ways:
+        prefix.append(convolve(prefix[-1], table))
+    suffix = [{0: 1}]
+    for table in reversed(ways):
+        suffix.append(convolve(suffix[-1], table))
+    suffix.reverse()
+
+    total = sum(n * weight(k) for k, n in prefix[-1].items())
+    if total == 0:
+        return estimate(sentences, unknown, mines)
+
+    result = {}
+    for c, table in enumerate(counts):
+        others = convolve(prefix[c], suffix[c + 1])
+        for k, (_, cells) in table.items():
+            rest = sum(n * weight(k + j) for j, n in others.items())
+            for cell, n in cells.items():
+                result[cell] = result.get(cell, 0) + n * rest
+    for cell in frontier:
+        result[cell] = result.get(cell, 0) / total
+
+    # Every cell off the frontier is equally likely to hold a mine
+    if interior:
+        mined = sum(n * math.comb(interior - 1, mines - k - 1)
+                    for k, n in prefix[-1].items()
+                    if 0 <= mines - k - 1 <= interior - 1)
+        for cell in unknown:
+            if cell not in frontier:
+                result[cell] = mined / total
+    return result
+
+
+def components(sentences):
+    """
+    Returns a list of (cells, sentences) for every set of cells linked
+    by shared sentences, with the cells in breadth-first order so that
+    each sentence's cells are close together.
+    """
+    containing = {}
+    for sentence in sentences:
+        for cell in sentence.cells:
+            containing.setdefault(cell, []).append(sentence)
+
+    result = []
+    seen = set()
+    used = set()
+    for start in sorted(containing):
+        if start in seen:
+            continue
+        seen.add(start)
+        cells = [start]
+        constraints = []
+        for cell in cells:
+            for sentence in containing[cell]:
+                if id(sentence) not in used:
+                    used.add(id(sentence))
+                    constraints.append(sentence)
+                    for other in sorted(sentence.cells):
+                        if other not in seen:
+                            seen.add(other)
+                            cells.append(other)
+        result.append((cells, constraints))
+    return result
+
+
+def enumerate_component(cells, sentences, deadline=None):
+    """
+    Returns, for every number of mines k that the cells can hold
+    consistently with the sentences, a pair (ways, counts): the number of
+    assignments with k mines, and for each cell how many of them put a
+    mine there.
+
+    Cells are assigned in order, and the assignments so far are grouped
+    by the mines still needed by the sentences they have started but not
+    finished, so that assignments which constrain the rest alike are
+    extended only once.
+    """
+    position = {cell: i for i, cell in enumerate(cells)}
+    spans = [sorted(position[cell] for cell in sentence.cells)
+             for sentence in sentences]
+
+    # Sentences containing each cell, with how many of their cells follow it
+    containing = [[] for _ in cells]
+    for s, span in enumerate(spans):
+        for remaining, i in enumerate(reversed(span)):
+            containing[i].append((s, remaining))
+
+    # Sentences started but not finished once each cell is assigned
+    active = [[s for s, span in enumerate(spans) if span[0] <= i < span[-1]]
+              for i in range(len(cells))]
+
+    # Assignments so far by the mines still needed by active sentences,
+    # then by mines used: [ways, mines per cell]
+    layer = {(): {0: [1, {}]}}
+    for i, cell in enumerate(cells):
+        before = active[i - 1] if i else []
+        following = {}
+        for state, table in layer.items():
+            if deadline is not None and time.perf_counter() > deadline:
+                raise Timeout
+            needed = dict(zip(before, state))
+            for mine in (0, 1):
+
+                # Each sentence must still be able to get its count
+                updated = {}
+                for s, remaining in containing[i]:
+                    n = needed.get(s, sentences[s].count) - mine
+                    if n < 0 or n > remaining:
+                        break
+                    updated[s] = n
+                else:
+                    key = tuple(updated.get(s, needed.get(s))
+                                for s in active[i])
+                    target = following.setdefault(key, {})
+                    for k, (ways, counts) in table.items():
+                        entry = target.get(k + mine)
+                        if entry is None:
+                            entry = target[k + mine] = [0, {}]
+                        entry[0] += ways
+                        for other, n in counts.items():
+                            entry[1][other] = entry[1].get(other, 0) + n
+                        if mine:
+                            entry[1][cell] = entry[1].get(cell, 0) + ways
+        layer = following
+
+    result = {}
+    for table in layer.values():
+        for k, (ways, counts) in table.items():
+            result[k] = (ways, counts)
+    return result
+
+
+def convolve(a, b):
+    """
+    Returns the numbers of ways to use k mines in two independent sets
+    of cells, given the numbers of ways for each.
+    """
+    result = {}
+    for i, m in a.items():
+        for j, n in b.items():
+            result[i + j] = result.get(i + j, 0) + m * n
+    return result
+
+
+def estimate(sentences, unknown, mines):
+    """
+    Returns a quick estimate of the probability that each unknown cell is
+    a mine: the highest density among the sentences that contain it, or
+    the density of mines among all unknown cells.
+    """
+    density = mines / len(unknown) if unknown else 0
+    result = {cell: density for cell in unknown}
+    frontier = set()
+    for sentence in sentences:
+        share = sentence.count / len(sentence.cells)
+        for cell in sentence.cells:
+            if cell in frontier:
+                result[cell] = max(result[cell], share)
+            else:
+                frontier.add(cell)
+                result[cell] = share
+    return result
@@ -0,0 +1,115 @@
+"""
+Headless Minesweeper simulation
+
+Plays games of Minesweeper against MinesweeperAI across a pool of worker
+processes, game i on a board seeded with seed + i, and reports the win
+rate, the moves per game and percentiles of the time the AI takes per
+move. A game is won once every safe cell has been revealed.
+"""
+import multiprocessing
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+# Command-line switches accepted by main
+OPTIONS = {"--bitset"}
+
+# Percentiles of the time per move to report
+PERCENTILES = [50, 90, 99]
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    settings = [option for option in options
+                if option.startswith(("--workers=", "--seed="))]
+    options = [option for option in options if option not in settings]
+    settings = dict(option[2:].split("=", 1) for option in settings)
+    if (len(args) not in (1, 4)
+            or any(option not in OPTIONS for option in options)):
+        sys.exit("Usage: python simulate.py [--bitset] [--workers=N] "
+                 "[--seed=S] games [height width mines]")
+    try:
+        games = int(args[0])
+        height, width, mines = (map(int, args[1:]) if len(args) == 4
+                                else (8, 8, 8))
+        workers = int(settings.get("workers", multiprocessing.cpu_count()))
+        seed = int(settings.get("seed", 0))
+    except ValueError:
+        sys.exit("Games, board size, workers and seed must be integers.")
+    if games < 1 or mines >= height * width:
+        sys.exit("There must be a game, and fewer mines than cells.")
+    bitset = "--bitset" in options
+
+    start = time.perf_counter()
+    tasks = [(seed + i, height, width, mines, bitset) for i in range(games)]
+    if workers <= 1:
+        results = [play(*task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.starmap(play, tasks,
+                                   chunksize=max(1, games // (workers * 8)))
+    elapsed = time.perf_counter() - start
+
+    report(results, elapsed, height, width, mines)
+
+
+def play(seed, height, width, mines, bitset=False):
+    """
+    Plays one game on a board seeded with seed, and returns whether the
+    AI won and the seconds it took to choose and learn from each move.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines,
+                       bitset=bitset)
+
+    latencies = []
+    safe = height * width - mines
+    while len(ai.moves_made) < safe:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                break
+        if game.is_mine(move):
+            latencies.append(time.perf_counter() - start)
+            return False, latencies
+        ai.add_knowledge(move, game.nearby_mines(move))
+        latencies.append(time.perf_counter() - start)
+    return len(ai.moves_made) == safe, latencies
+
+
+def report(results, elapsed, height, width, mines):
+    """
+    Prints the win rate, moves per game and percentiles of the time
+    per move over the results of every game.
+    """
+    games = len(results)
+    wins = sum(won for won, _ in results)
+    latencies = sorted(latency for _, moves in results for latency in moves)
+
+    print(f"Games: {games} on {height}x{width} with {mines} mines")
+    print(f"Win rate: {wins / games:.4f} ({wins} won)")
+    print(f"Moves per game: {len(latencies) / games:.1f}")
+    if latencies:
+        ms = [f"p{p} {percentile(latencies, p) * 1000:.3f}"
+              for p in PERCENTILES]
+        ms.append(f"max {latencies[-1] * 1000:.3f}")
+        print(f"Milliseconds per move: {', '.join(ms)}")
+    print(f"Elapsed: {elapsed:.2f}s ({games / elapsed:.1f} games/s)")
+
+
+def percentile(values, p):
+    """
+    Returns the p-th percentile of a sorted list, by nearest rank.
+    """
+    rank = max(1, -(-len(values) * p // 100))
+    return values[rank - 1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark of the Tic Tac Toe engines
+
+Asks every engine for a move on a fixed set of positions, starting from
+cold caches, and prints one JSON object per (engine, position) with the
+nodes visited, cutoffs, cache hits, wall time and peak memory allocated.
+Every move is checked against an exhaustive minimax, and the exit status
+is 1 if any engine chose a move that changes the game's value.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import bitboard
+import book
+import mnk
+import tictactoe as ttt
+
+# Positions to benchmark, one string of nine cells per board, row by row
+POSITIONS = [
+    "---------",
+    "X--------",
+    "----X----",
+    "X---O----",
+    "X-O-X----",
+    "XO--X---O",
+    "X-O-O-X--",
+    "XOXOX----",
+    "XXO-O--X-",
+    "OX-XO-X--"
+]
+
+# Exhaustive minimax value of every board evaluated so far
+values = {}
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [repeats]")
+    repeats = int(sys.argv[1]) if len(sys.argv) == 2 else 3
+
+    engines = [
+        ("tictactoe", run_tictactoe),
+        ("bitboard", run_bitboard),
+        ("mnk", run_mnk)
+    ]
+    opening_book = book.load()
+    if opening_book is not None:
+        engines.append(("book", lambda board: run_book(opening_book, board)))
+
+    # Search from scratch, even if the opening book has been built
+    ttt.opening_book = None
+
+    mismatches = 0
+    for position in POSITIONS:
+        board = parse(position)
+        optimal = value(board)
+        for name, run in engines:
+            record = measure(run, board, repeats)
+            record["engine"] = name
+            record["position"] = position
+            after = ttt.result(board, record["move"])
+            record["correct"] = value(after) == optimal
+            mismatches += not record["correct"]
+            record["move"] = list(record["move"])
+            print(json.dumps(record))
+
+    if mismatches:
+        sys.exit(f"{mismatches} moves disagree with exhaustive minimax.")
+
+
+def parse(position):
+    """
+    Returns the board written as a string of nine cells.
+    """
+    cells = [ttt.EMPTY if cell == "-" else cell for cell in position]
+    return [cells[0:3], cells[3:6], cells[6:9]]
+
+
+def measure(run, board, repeats):
+    """
+    Returns the counters of one move by an engine, the best wall time
+    over a number of repeats, and the peak memory allocated.
+    """
+    seconds = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        move, counters = run(board)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+    tracemalloc.start()
+    run(board)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record = {"move": move, "seconds": seconds, "peak_bytes": peak}
+    record.update(counters)
+    return record
+
+
+def run_tictactoe(board):
+    ttt.reset_table()
+    move = ttt.minimax(board)
+    return move, {
+        "nodes": ttt.search_stats["nodes"],
+        "cutoffs": ttt.search_stats["cutoffs"],
+        "tt_hits": ttt.table_stats["hits"]
+    }
+
+
+def run_bitboard(board):
+    bitboard.values.clear()
+    bitboard.stats["nodes"] = 0
+    bitboard.stats["hits"] = 0
+    move = bitboard.minimax(bitboard.from_board(board))
+    return move, {
+        "nodes": bitboard.stats["nodes"],
+        "cutoffs": None,
+        "tt_hits": bitboard.stats["hits"]
+    }
+
+
+def run_mnk(board):
+    game = mnk.Game()
+    move = game.minimax(board)
+    return move, {
+        "nodes": game.stats["nodes"],
+        "cutoffs": game.stats["cutoffs"],
+        "tt_hits": None
+    }
+
+
+def run_book(opening_book, board):
+    return book.move(opening_book, board), {
+        "nodes": 0,
+        "cutoffs": None,
+        "tt_hits": None
+    }
+
+
+def value(board):
+    """
+    Returns the minimax value of a board by exhaustive search,
+    without any pruning.
+    """
+    key = tuple(cell for row in board for cell in row)
+    if key not in values:
+        if ttt.terminal(board):
+            values[key] = ttt.utility(board)
+        else:
+            results = [value(ttt.result(board, action))
+                       for action in ttt.actions(board)]
+            if ttt.player(board) == ttt.X:
+                values[key] = max(results)
+            else:
+                values[key] = min(results)
+    return values[key]
+
+
+if __name__ == "__main__":
+    main()
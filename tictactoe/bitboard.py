@@ -0,0 +1,184 @@
+"""
+Tic Tac Toe Player on bitboards
+
+A position is a pair (x, o) of 9-bit integers, where bit 3 * i + j
+is set if that player has played at cell (i, j).
+"""
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Bitmasks of the eight lines of three cells
+WINS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+# Bit of every cell, indexed by (i, j)
+CELLS = {(i, j): 1 << (3 * i + j) for i in range(3) for j in range(3)}
+
+# Minimax value of every position searched so far
+values = {}
+
+# Positions searched by value, and those answered from values
+stats = {"nodes": 0, "hits": 0}
+
+
+def initial_state():
+    """
+    Returns starting position of the board.
+    """
+    return (0, 0)
+
+
+def from_board(board):
+    """
+    Returns the position of a board in list of lists form.
+    """
+    x = o = 0
+    for (i, j), bit in CELLS.items():
+        if board[i][j] == X:
+            x |= bit
+        elif board[i][j] == O:
+            o |= bit
+    return (x, o)
+
+
+def to_board(position):
+    """
+    Returns the board of a position in list of lists form.
+    """
+    x, o = position
+    board = [[EMPTY, EMPTY, EMPTY] for _ in range(3)]
+    for (i, j), bit in CELLS.items():
+        if x & bit:
+            board[i][j] = X
+        elif o & bit:
+            board[i][j] = O
+    return board
+
+
+def player(position):
+    """
+    Returns player who has the next turn on a position.
+    """
+    x, o = position
+    return X if x.bit_count() == o.bit_count() else O
+
+
+def actions(position):
+    """
+    Returns set of all possible actions (i, j) available on the position.
+    """
+    taken = position[0] | position[1]
+    return {cell for cell, bit in CELLS.items() if not taken & bit}
+
+
+def result(position, action):
+    """
+    Returns the position that results from making move (i, j).
+    """
+    x, o = position
+    bit = CELLS[action]
+    if (x | o) & bit:
+        raise ValueError("This action is not permitted")
+    if x.bit_count() == o.bit_count():
+        return (x | bit, o)
+    return (x, o | bit)
+
+
+def winner(position):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = position
+    for mask in WINS:
+        if x & mask == mask:
+            return X
+        if o & mask == mask:
+            return O
+    return None
+
+
+def terminal(position):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return winner(position) is not None or position[0] | position[1] == FULL
+
+
+def utility(position):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    w = winner(position)
+    if w == X:
+        return 1
+    elif w == O:
+        return -1
+    return 0
+
+
+def value(position):
+    """
+    Returns the minimax value of a position: 1 if X wins with best play,
+    -1 if O does, 0 for a tie.
+    """
+    if position in values:
+        stats["hits"] += 1
+        return values[position]
+    stats["nodes"] += 1
+
+    x, o = position
+    if winner(position) is not None or x | o == FULL:
+        v = utility(position)
+    elif x.bit_count() == o.bit_count():
+        v = -1
+        for bit in moves(x | o):
+            v = max(v, value((x | bit, o)))
+            if v == 1:
+                break
+    else:
+        v = 1
+        for bit in moves(x | o):
+            v = min(v, value((x, o | bit)))
+            if v == -1:
+                break
+    values[position] = v
+    return v
+
+
+def moves(taken):
+    """
+    Returns the bit of every free cell, lowest first.
+    """
+    bits = []
+    free = FULL & ~taken
+    while free:
+        bit = free & -free
+        bits.append(bit)
+        free ^= bit
+    return bits
+
+
+def minimax(position):
+    """
+    Returns the optimal action for the current player on the position.
+    """
+    if terminal(position):
+        return None
+
+    best = None
+    best_value = None
+    sign = 1 if player(position) == X else -1
+    for action in sorted(actions(position)):
+        v = sign * value(result(position, action))
+        if best_value is None or v > best_value:
+            best, best_value = action, v
+            if v == 1:
+                break
+    return best
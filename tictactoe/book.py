@@ -0,0 +1,103 @@
+"""
+Solved table of every reachable Tic Tac Toe position
+
+The book is a file of 3 ** 9 bytes, one per board, indexed by reading
+the cells (3 * i + j) as base 3 digits: 0 for empty, 1 for X, 2 for O.
+A byte holds the optimal move's cell in its low four bits and the
+position's value plus one in the next two, or NONE for boards that are
+terminal or unreachable.
+"""
+import os
+import sys
+
+import bitboard
+
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+SIZE = 3 ** 9
+NONE = 0xFF
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [path]")
+    path = sys.argv[1] if len(sys.argv) == 2 else PATH
+
+    table = build()
+    with open(path, "wb") as f:
+        f.write(table)
+    solved = sum(entry != NONE for entry in table)
+    print(f"Solved {solved} positions into {path}.")
+
+
+def build():
+    """
+    Returns the book, solving every reachable position once.
+    """
+    table = bytearray([NONE]) * SIZE
+    seen = set()
+    stack = [bitboard.initial_state()]
+    while stack:
+        position = stack.pop()
+        if position in seen:
+            continue
+        seen.add(position)
+        if bitboard.terminal(position):
+            continue
+        i, j = bitboard.minimax(position)
+        entry = (3 * i + j) | (bitboard.value(position) + 1) << 4
+        table[index(bitboard.to_board(position))] = entry
+        for action in bitboard.actions(position):
+            stack.append(bitboard.result(position, action))
+    return bytes(table)
+
+
+def load(path=PATH):
+    """
+    Returns the book stored at a path, or None if there is no valid book.
+    """
+    try:
+        with open(path, "rb") as f:
+            table = f.read()
+    except OSError:
+        return None
+    if len(table) != SIZE:
+        return None
+    return table
+
+
+def index(board):
+    """
+    Returns the entry of a board in the book.
+    """
+    i = 0
+    for row in reversed(board):
+        for cell in reversed(row):
+            i = 3 * i + (1 if cell == "X" else 2 if cell == "O" else 0)
+    return i
+
+
+def move(table, board):
+    """
+    Returns the optimal action (i, j) for the current player on a board,
+    or None if the book has no entry for it.
+    """
+    entry = table[index(board)]
+    if entry == NONE:
+        return None
+    return divmod(entry & 0xF, 3)
+
+
+def value(table, board):
+    """
+    Returns the value of a board: 1 if X wins with best play, -1 if O
+    does, 0 for a tie, or None if the book has no entry for it.
+    """
+    entry = table[index(board)]
+    if entry == NONE:
+        return None
+    return (entry >> 4) - 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+m,n,k-game Player
+
+Tic Tac Toe generalized to boards of any number of rows and columns,
+won by the first player to get k marks in a row.
+"""
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a win found at the root; wins found deeper score one less per ply
+WIN = 10 ** 9
+
+# Number of nodes searched between two checks of the time budget
+CHECK_EVERY = 1024
+
+
+class Timeout(Exception):
+    """Raised inside a search that has run out of time."""
+
+
+def line_heuristic(game, cells):
+    """
+    Scores a flat board from X's point of view: every line of k cells
+    that only one player has marked is worth 10 to the power of the
+    number of marks in it, to that player.
+    """
+    score = 0
+    for line in game.lines:
+        xs = os = 0
+        for cell in line:
+            if cells[cell] == X:
+                xs += 1
+            elif cells[cell] == O:
+                os += 1
+        if os == 0 and xs:
+            score += 10 ** xs
+        elif xs == 0 and os:
+            score -= 10 ** os
+    return score
+
+
+class Game():
+    """
+    m,n,k-game with the same functions as the tictactoe module, so that
+    an instance can stand in for it, and a minimax that searches with
+    iterative deepening alpha-beta, killer and history move ordering and
+    a heuristic evaluation at the depth limit.
+    """
+
+    X = X
+    O = O
+    EMPTY = EMPTY
+
+    def __init__(self, rows=3, columns=3, k=3, time_budget=None,
+                 heuristic=line_heuristic):
+        """
+        time_budget is the number of seconds minimax may spend on a move,
+        or None to always search to the end of the game. heuristic(game,
+        cells) scores a flat list of cells from X's point of view.
+        """
+        if k > max(rows, columns):
+            raise ValueError("k must fit on the board")
+        self.rows = rows
+        self.columns = columns
+        self.k = k
+        self.time_budget = time_budget
+        self.heuristic = heuristic
+
+        # Flat cell indices of every line of k cells
+        self.lines = []
+        for i in range(rows):
+            for j in range(columns):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < columns:
+                        self.lines.append(tuple(
+                            (i + di * step) * columns + j + dj * step
+                            for step in range(k)
+                        ))
+
+        # Lines through every cell, to check only those after a move
+        self.lines_through = [[] for _ in range(rows * columns)]
+        for line in self.lines:
+            for cell in line:
+                self.lines_through[cell].append(line)
+
+        self.stats = {"nodes": 0, "cutoffs": 0, "depth": 0}
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.columns for _ in range(self.rows)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        xs = sum(row.count(X) for row in board)
+        os = sum(row.count(O) for row in board)
+        return X if xs == os else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i, row in enumerate(board)
+                for j, cell in enumerate(row) if cell is EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] is not EMPTY:
+            raise ValueError("This action is not permitted")
+        result = [list(row) for row in board]
+        result[i][j] = self.player(board)
+        return result
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = self.flatten(board)
+        for line in self.lines:
+            first = cells[line[0]]
+            if first is not EMPTY and all(cells[cell] == first
+                                          for cell in line):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        if self.winner(board) is not None:
+            return True
+        return all(cell is not EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner = self.winner(board)
+        if winner == X:
+            return 1
+        elif winner == O:
+            return -1
+        return 0
+
+    def flatten(self, board):
+        return [cell for row in board for cell in row]
+
+    def wins(self, cells, cell):
+        """
+        Returns True if the mark at a cell completes a line.
+        """
+        mark = cells[cell]
+        for line in self.lines_through[cell]:
+            if all(cells[other] == mark for other in line):
+                return True
+        return False
+
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        as far as the search gets within the time budget.
+        """
+        if self.terminal(board):
+            return None
+
+        cells = self.flatten(board)
+        mark = self.player(board)
+        empty = cells.count(EMPTY)
+        self.stats = {"nodes": 0, "cutoffs": 0, "depth": 0}
+        self.deadline = (None if self.time_budget is None
+                         else time.perf_counter() + self.time_budget)
+        self.killers = [[] for _ in range(empty + 1)]
+        self.history = {}
+
+        moves = [cell for cell, value in enumerate(cells) if value is EMPTY]
+        best = moves[0]
+        for depth in range(1, empty + 1):
+            try:
+                score, move = self.search_root(cells, mark, moves, depth,
+                                               empty)
+            except Timeout:
+                break
+            best = move
+            self.stats["depth"] = depth
+
+            # Search the best move first at the next depth
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN - empty:
+                break
+
+        return divmod(best, self.columns)
+
+    def search_root(self, cells, mark, moves, depth, empty):
+        """
+        Returns the (score, move) of the best of moves,
+        searching each to the given depth.
+        """
+        alpha, beta = -WIN - 1, WIN + 1
+        best_score, best_move = -WIN - 1, moves[0]
+        for move in moves:
+            cells[move] = mark
+            score = -self.negamax(cells, other(mark), depth - 1, -beta,
+                                  -alpha, 1, move, empty - 1)
+            cells[move] = EMPTY
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def negamax(self, cells, mark, depth, alpha, beta, ply, last, empty):
+        """
+        Returns the score of a flat board for the player to move, mark,
+        searched to the given depth within an (alpha, beta) window.
+        last is the cell the opponent has just marked.
+        """
+        self.stats["nodes"] += 1
+        if (self.deadline is not None
+                and self.stats["nodes"] % CHECK_EVERY == 0
+                and time.perf_counter() > self.deadline):
+            raise Timeout
+
+        if self.wins(cells, last):
+            return -(WIN - ply)
+        if empty == 0:
+            return 0
+        if depth == 0:
+            score = self.heuristic(self, cells)
+            return score if mark == X else -score
+
+        best = -WIN - 1
+        for move in self.ordered(cells, ply):
+            cells[move] = mark
+            score = -self.negamax(cells, other(mark), depth - 1, -beta,
+                                  -alpha, ply + 1, move, empty - 1)
+            cells[move] = EMPTY
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                self.stats["cutoffs"] += 1
+                self.remember(move, ply, depth)
+                break
+        return best
+
+    def ordered(self, cells, ply):
+        """
+        Returns the empty cells of a flat board, killer moves of this ply
+        first and then by history score.
+        """
+        moves = [cell for cell, value in enumerate(cells) if value is EMPTY]
+        killers = self.killers[ply]
+        history = self.history
+        moves.sort(key=lambda move: (move not in killers,
+                                     -history.get(move, 0)))
+        return moves
+
+    def remember(self, move, ply, depth):
+        """
+        Records a move that caused a cutoff as a killer of its ply,
+        and raises its history score.
+        """
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+
+def other(mark):
+    return O if mark == X else X
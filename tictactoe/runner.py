@@ -2,8 +2,15 @@ import pygame
 import sys
 import time
 
+import mnk
 import tictactoe as ttt
 
+# Play an m,n,k-game instead, if given its rows, columns and k
+if len(sys.argv) == 4:
+    ttt = mnk.Game(*[int(arg) for arg in sys.argv[1:]], time_budget=2)
+elif len(sys.argv) != 1:
+    sys.exit("Usage: python runner.py [rows columns k]")
+
 pygame.init()
 size = width, height = 600, 400
 
@@ -15,12 +22,16 @@ screen = pygame.display.set_mode(size)
 
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
 user = None
 board = ttt.initial_state()
 ai_turn = False
 
+# Board size, with tiles shrunk to fit boards larger than 3x3
+rows, columns = len(board), len(board[0])
+tile_size = min(80, int(240 / max(rows, columns)))
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", int(0.75 * tile_size))
+
 while True:
 
     for event in pygame.event.get():
@@ -67,13 +78,12 @@ while True:
     else:
 
         # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
+        tile_origin = (width / 2 - (columns / 2 * tile_size),
+                       height / 2 - (rows / 2 * tile_size))
         tiles = []
-        for i in range(3):
+        for i in range(rows):
             row = []
-            for j in range(3):
+            for j in range(columns):
                 rect = pygame.Rect(
                     tile_origin[0] + j * tile_size,
                     tile_origin[1] + i * tile_size,
@@ -122,8 +132,8 @@ while True:
         click, _, _ = pygame.mouse.get_pressed()
         if click == 1 and user == player and not game_over:
             mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
+            for i in range(rows):
+                for j in range(columns):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
                         board = ttt.result(board, (i, j))
 
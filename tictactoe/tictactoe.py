@@ -2,6 +2,7 @@
 Tic Tac Toe Player
 """
 from helper import *
+import book
 import math
 import copy
 
@@ -9,6 +10,35 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# For each rotation and reflection of the board, the flat cell index
+# (3 * i + j) that lands on each cell
+SYMMETRIES = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8],
+    [6, 3, 0, 7, 4, 1, 8, 5, 2],
+    [8, 7, 6, 5, 4, 3, 2, 1, 0],
+    [2, 5, 8, 1, 4, 7, 0, 3, 6],
+    [2, 1, 0, 5, 4, 3, 8, 7, 6],
+    [6, 7, 8, 3, 4, 5, 0, 1, 2],
+    [0, 3, 6, 1, 4, 7, 2, 5, 8],
+    [8, 5, 2, 7, 4, 1, 6, 3, 0]
+]
+
+# Kinds of value stored in the transposition table
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Transposition table: maps the canonical encoding of every position
+# searched so far to its (value, kind)
+table = {}
+table_stats = {"hits": 0, "misses": 0}
+
+# Positions visited and pruned by max_value and min_value
+search_stats = {"nodes": 0, "cutoffs": 0}
+
+# Solved table of every reachable position, if `python book.py` has built it
+opening_book = book.load()
+
 
 def initial_state():
     """
@@ -137,34 +167,85 @@ def utility(board):
     else:
         return -1
 
+def canonical(board):
+    """
+    Returns a string encoding the board that is the same
+    for all of its rotations and reflections.
+    """
+    cells = [cell or "-" for row in board for cell in row]
+    return min("".join(cells[i] for i in symmetry) for symmetry in SYMMETRIES)
+
+
+def reset_table():
+    """
+    Empties the transposition table, and zeroes its hit/miss counters
+    and the search counters.
+    """
+    table.clear()
+    table_stats["hits"] = 0
+    table_stats["misses"] = 0
+    search_stats["nodes"] = 0
+    search_stats["cutoffs"] = 0
+
+
 def max_value(board, v):
+    search_stats["nodes"] += 1
+    key = canonical(board)
+    if key in table:
+        value, kind = table[key]
+        if kind == EXACT or (kind == LOWER and value > v):
+            table_stats["hits"] += 1
+            return value
+    table_stats["misses"] += 1
+
     if terminal(board):
+        table[key] = (utility(board), EXACT)
         return utility(board)
     value = float("-inf")
+    kind = EXACT
     for action in actions(board):
         v_new = min_value(result(board, action), value)
 
         if v_new > value:
             value = v_new
-        if value > v:
-            break
         if value == 1:
+            search_stats["cutoffs"] += 1
+            break
+        if value > v:
+            kind = LOWER
+            search_stats["cutoffs"] += 1
             break
+    table[key] = (value, kind)
     return value
 
 def min_value(board,v):
+    search_stats["nodes"] += 1
+    key = canonical(board)
+    if key in table:
+        value, kind = table[key]
+        if kind == EXACT or (kind == UPPER and value < v):
+            table_stats["hits"] += 1
+            return value
+    table_stats["misses"] += 1
+
     if terminal(board):
+        table[key] = (utility(board), EXACT)
         return utility(board)
     value = float("inf")
+    kind = EXACT
     for action in actions(board):
         v_new = max_value(result(board, action), value)
 
         if v_new < value:
             value = v_new
-        if value < v:
-            break
         if value == -1:
+            search_stats["cutoffs"] += 1
             break
+        if value < v:
+            kind = UPPER
+            search_stats["cutoffs"] += 1
+            break
+    table[key] = (value, kind)
     return value
 
 def minimax(board):
@@ -174,6 +255,11 @@ def minimax(board):
     if terminal(board):
         return None
 
+    if opening_book is not None:
+        optimal = book.move(opening_book, board)
+        if optimal is not None:
+            return optimal
+
     optimal = None
 
     if player(board) == X: